@@ -1,7 +1,6 @@
-from __future__ import absolute_import
-
+import errno
+import itertools
 import os
-import threading
 
 from . import __version__
 
@@ -11,17 +10,12 @@ from . import applicationentity
 from . import sopclass
 
 
-_tls = threading.local()
+_msg_ids = itertools.count()
 
 
 def _new_msg_id():
-    msg_id = getattr(_tls, 'msg_id', None)
-    if msg_id is None:
-        _tls.msg_id = 1
-        return _tls.msg_id
-
-    _tls.msg_id += 1
-    return _tls.msg_id
+    # Message ID is a 16-bit value, so counter wraps around to stay in 1..65535 range
+    return next(_msg_ids) % 0xFFFF + 1
 
 
 def c_find(remote_ae, local_aet, ds, root=sopclass.PATIENT_ROOT_FIND_SOP_CLASS):
@@ -43,15 +37,26 @@ def c_find(remote_ae, local_aet, ds, root=sopclass.PATIENT_ROOT_FIND_SOP_CLASS):
             yield result, status
 
 
+_CREATE_FLAGS = os.O_RDWR | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+
+
 def _get_storage_file(context, command_set, path):
-    file_name = '{}.dcm'.format(command_set.AffectedSOPInstanceUID)
-    full_name = os.path.join(path, file_name)
+    instance_uid = command_set.AffectedSOPInstanceUID
+    full_name = os.path.join(path, '{}.dcm'.format(instance_uid))
     i = 0
-    while os.path.exists(full_name):
-        i += 1
-        full_name = '{}_{}'.format(full_name, i)
-
-    ds = open(os.path.join(path, file_name), 'w+b')
+    while True:
+        # file is created atomically, so concurrent associations never share the same file
+        try:
+            fd = os.open(full_name, _CREATE_FLAGS, 0o644)
+        except OSError as exc:
+            if exc.errno != errno.EEXIST:
+                raise
+            i += 1
+            full_name = os.path.join(path, '{}_{}.dcm'.format(instance_uid, i))
+        else:
+            break
+
+    ds = os.fdopen(fd, 'w+b')
     start = ds.tell()
     try:
         applicationentity.write_meta(ds, command_set, context.supported_ts)
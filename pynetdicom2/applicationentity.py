@@ -20,18 +20,18 @@ Please refer to base class for each of them (:class:`~pynetdicom2.applicationent
 more detailed information on common principles and options when working with Application Entities.
 """
 
-from __future__ import absolute_import, unicode_literals
-
 from functools import partial
-from itertools import count
+import queue
 import threading
 from threading import Lock
 import tempfile
 import platform
-import copy
 import contextlib
+import selectors
+import socket
+import socketserver
+import weakref
 
-from six.moves import socketserver, zip  # type: ignore
 from pydicom import Dataset
 from pydicom import filebase
 from pydicom.filewriter import write_file_meta_info
@@ -39,12 +39,21 @@ from pydicom import uid
 
 from . import asceprovider
 from . import exceptions
+from . import fsm
+from . import pdu
 from . import statuses
 
 
 # current implementation UID. Generated by pydicom
 PREAMBLE = b'\0' * 128 + b'DICM'
 
+# local host name used as a local AE address
+_NODE = platform.node()
+
+# A-ASSOCIATE-RJ sent when AE can't handle any more associations
+# (rejected-transient, service-provider (presentation), local-limit-exceeded)
+_BUSY_REJECT = pdu.AAssociateRjPDU(2, 3, 2).encode()
+
 
 def write_meta(fp, command_set, ts):
     """Writes file meta information.
@@ -66,6 +75,17 @@ def write_meta(fp, command_set, ts):
     write_file_meta_info(filebase.DicomFileLike(fp), meta)
 
 
+# interned SOP Class UIDs, so all presentation contexts and AEs share the same instances
+_UIDS = weakref.WeakValueDictionary()
+
+
+def _as_uid(value):
+    try:
+        return _UIDS[value]
+    except KeyError:
+        return _UIDS.setdefault(value, value if isinstance(value, uid.UID) else uid.UID(value))
+
+
 class AEBase(object):
     """Base Application Entity class.
 
@@ -84,6 +104,9 @@ class AEBase(object):
                          :attr:`pynetdicom2.applicationentity.AEBase.default_ts`.
     :ivar timeout: Connection timeout in seconds. Default value is 15.
     :ivar max_pdu_length: Maximum size of PDU in bytes.
+    :ivar tcp_nodelay: Indicates if Nagle's algorithm is disabled on association sockets.
+    :ivar recv_buffer_size: Explicit ``SO_RCVBUF`` size or ``None``.
+    :ivar send_buffer_size: Explicit ``SO_SNDBUF`` size or ``None``.
     :ivar supported_scu: Dictionary that maps Abstract syntax UIDs to specific
                          services that are support in SCU role.
                          This attribute is populated by adding services using
@@ -107,15 +130,21 @@ class AEBase(object):
     Default list of supported transfer syntaxes.
     """
 
-    def __init__(self, supported_ts, max_pdu_length):
+    def __init__(self, supported_ts, max_pdu_length, *, tcp_nodelay=True,
+                 recv_buffer_size=None, send_buffer_size=None):
         if supported_ts is None:
             supported_ts = self.default_ts
 
         self.supported_ts = frozenset(supported_ts)
         self.timeout = 15
         self.max_pdu_length = max_pdu_length
+        self.tcp_nodelay = tcp_nodelay
+        self.recv_buffer_size = recv_buffer_size
+        self.send_buffer_size = send_buffer_size
 
         self.context_def_list = {}
+        self._pres_context_items = (None, ())
+        self._next_pc_id = 1
         self.store_in_file = set()
         self.supported_scu = {}
         self.supported_scp = {}
@@ -131,15 +160,13 @@ class AEBase(object):
         :param service: DICOM service
         :param sop_classes: overrides list of SOP Class UIDs provided by the service
         """
-        sop_classes = sop_classes or service.sop_classes
-        self.supported_scu.update({
-            uid: service for uid in sop_classes
-        })
-        store_in_file = (hasattr(service, 'store_in_file') and
-                         service.store_in_file)
-        self.update_context_def_list(sop_classes, store_in_file)
+        self._add_service(self.supported_scu, service, sop_classes or service.sop_classes)
         return self
 
+    def _add_service(self, supported, service, sop_classes):
+        supported.update(dict.fromkeys(sop_classes, service))
+        self.update_context_def_list(sop_classes, getattr(service, 'store_in_file', False))
+
     def update_context_def_list(self, sop_classes, store_in_file=False):
         """Updates presentation context definition list.
 
@@ -148,24 +175,47 @@ class AEBase(object):
         :param store_in_file: indicates if incoming datasets for these SOP
                               Classes should be stored in file.
         """
-        start = max(self.context_def_list.keys()) + 2 if self.context_def_list \
-            else 1
-
-        self.context_def_list.update(
-            self._build_context_def_list(sop_classes, start, store_in_file)
-        )
+        with self.lock:
+            new_contexts = self._build_context_def_list(sop_classes, self._next_pc_id,
+                                                        store_in_file)
+            self._next_pc_id += 2 * len(new_contexts)
+            context_def_list = self.context_def_list.copy()
+            context_def_list.update(new_contexts)
+            # Rebinding the attribute is atomic, so readers never need the lock
+            self.context_def_list = context_def_list
 
     def copy_context_def_list(self):
         """Makes a shallow copy of presentation context definition list.
 
         .. note::
 
-            This method is tread-safe.
+            This method is tread-safe. Writers never mutate published
+            dictionary in place, so no lock is taken here. ``PContextDef``
+            instances are shared between copies and must be treated as
+            immutable.
 
         :return: copy of the presentation context definition list.
         """
-        with self.lock:
-            return copy.copy(self.context_def_list)
+        return self.context_def_list.copy()
+
+    def get_pres_context_items(self):
+        """Returns current presentation context definition list along with
+        Presentation Context Items built from it.
+
+        Items are built once for each published version of the definition list
+        and then shared by all association requests, so both returned values
+        must be treated as read-only.
+
+        :return: tuple (presentation context definition list, tuple of
+                 :class:`~pynetdicom2.pdu.PresentationContextItemRQ`)
+        """
+        context_def_list = self.context_def_list
+        cached = self._pres_context_items
+        if cached[0] is not context_def_list:
+            cached = (context_def_list,
+                      tuple(asceprovider.build_pres_context_def_list(context_def_list)))
+            self._pres_context_items = cached
+        return cached
 
     @contextlib.contextmanager
     def request_association(self, remote_ae):
@@ -198,6 +248,14 @@ class AEBase(object):
                 assoc.kill()
             raise
 
+    def configure_socket(self, sock):
+        """Applies AE TCP options (Nagle's algorithm, buffer sizes) to the socket.
+
+        :param sock: association (or listening) socket
+        """
+        fsm.configure_socket(sock, self.tcp_nodelay, self.recv_buffer_size,
+                             self.send_buffer_size)
+
     def get_file(self, context, command_set):  # pylint: disable=no-self-use
         """Method is used by association to get file-like object to store
         dataset.
@@ -278,7 +336,7 @@ class AEBase(object):
         :param ds: dataset with C-FIND parameters
         :return: iterator that returns tuples: (<result dataset>, <status code>)
         """
-        return iter([])
+        return iter(())
 
     def on_receive_move(self, context, ds, destination):  # pylint: disable=unused-argument,no-self-use
         """Default handling of C-MOVE command. Returns empty empty values
@@ -290,7 +348,7 @@ class AEBase(object):
         :return: tuple: remote AE parameters, number of operations and iterator
                  that will return datasets for moving
         """
-        return None, 0, iter([])
+        return None, 0, iter(())
 
     def on_commitment_request(self, remote_ae, uids):  # pylint: disable=no-self-use
         """Handle storage commitment request.
@@ -323,10 +381,9 @@ class AEBase(object):
     def _build_context_def_list(self, sop_classes, start, store_in_file):
         if store_in_file:
             self.store_in_file.update(sop_classes)
-        return {pc_id: asceprovider.PContextDef(pc_id, uid.UID(sop_class),
-                                                self.supported_ts)
-                for sop_class, pc_id in zip(sop_classes,
-                                            count(start, 2))}
+        return {start + 2 * i: asceprovider.PContextDef(start + 2 * i, _as_uid(sop_class),
+                                                        self.supported_ts)
+                for i, sop_class in enumerate(sop_classes)}
 
 
 class ClientAE(AEBase):
@@ -340,17 +397,68 @@ class ClientAE(AEBase):
                          using Storage or Q/R C-GET services be sure to
                          add only transfer syntax of the expected dataset.
     :param max_pdu_length: maximum PDU length in bytes (defaults to 64kb).
+    :param tcp_nodelay: if ``True`` (default) Nagle's algorithm is disabled on
+                        association sockets
+    :param recv_buffer_size: ``SO_RCVBUF`` size for association sockets. By default buffer
+                             size is left to kernel auto-tuning
+    :param send_buffer_size: ``SO_SNDBUF`` size for association sockets. By default buffer
+                             size is left to kernel auto-tuning
     """
-    def __init__(self, ae_title, supported_ts=None,
-                 max_pdu_length=65536):
+    def __init__(self, ae_title, supported_ts=None, max_pdu_length=65536, *,
+                 tcp_nodelay=True, recv_buffer_size=None, send_buffer_size=None):
         """Initializes new ClientAE instance"""
-        super(ClientAE, self).__init__(supported_ts, max_pdu_length)
-        self.local_ae = {'address': platform.node(), 'aet': ae_title}
+        super(ClientAE, self).__init__(supported_ts, max_pdu_length, tcp_nodelay=tcp_nodelay,
+                                       recv_buffer_size=recv_buffer_size,
+                                       send_buffer_size=send_buffer_size)
+        self.local_ae = {'address': _NODE, 'aet': ae_title}
 
 
-class AE(AEBase, socketserver.ThreadingTCPServer):
+class _WorkerPool(object):
+    """Fixed-size pool of daemon worker threads.
+
+    Unlike :class:`concurrent.futures.ThreadPoolExecutor` workers are daemon threads, so
+    associations that are still in progress do not block interpreter exit.
+    Workers are started on demand, up to ``max_workers``.
+    """
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self._tasks = queue.Queue()
+        self._workers = []
+
+    def submit(self, func, *args):
+        """Schedules ``func(*args)`` to be run by one of the workers."""
+        self._tasks.put((func, args))
+        if len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._work, daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def shutdown(self):
+        """Stops workers once they are done with already scheduled tasks."""
+        for _ in self._workers:
+            self._tasks.put(None)
+
+    def _work(self):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            func, args = task
+            func(*args)
+
+
+class AE(AEBase, socketserver.TCPServer):
     """Represents a DICOM application entity based on
-    ``SocketServer.ThreadingTCPServer``
+    ``SocketServer.TCPServer``
+
+    Incoming associations are handled by a pool of worker threads, so the number of
+    concurrently handled associations is limited by ``max_associations``. Association
+    requests exceeding this limit are rejected (rejected-transient, local-limit-exceeded):
+    pre-encoded A-ASSOCIATE-RJ PDU is written straight to the socket by one of at most
+    ``max_rejecting`` threads. If all of them are busy, connection is closed right away.
+    Worker threads are daemon threads, so associations still in progress do not prevent
+    the process from exiting.
 
     Unlike :class:`~pynetdicom2.applicationentity.ClientAE` this one is fully
     functional application entity that can take on both SCU and SCP roles.
@@ -369,24 +477,65 @@ class AE(AEBase, socketserver.ThreadingTCPServer):
     :param port: port that AE listens on for incoming connection
     :param supported_ts: list of transfer syntaxes supported by AE
     :param max_pdu_length: maximum PDU length in bytes (defaults to 64kb).
+    :param bind_and_activate: if ``True`` server socket is bound and activated
+                              right away, otherwise it's done upon entering context
+    :param max_associations: maximum number of concurrently handled associations
+                             (at least 1)
+    :param tcp_nodelay: if ``True`` (default) Nagle's algorithm is disabled on
+                        association sockets
+    :param recv_buffer_size: ``SO_RCVBUF`` size for association sockets. By default buffer
+                             size is left to kernel auto-tuning
+    :param send_buffer_size: ``SO_SNDBUF`` size for association sockets. By default buffer
+                             size is left to kernel auto-tuning
+    """
+
+    request_queue_size = socket.SOMAXCONN
+    """Listen backlog, large enough to absorb bursts of incoming associations"""
+
+    allow_reuse_address = True
+    """Allows AE to be restarted while old connections are in ``TIME_WAIT``"""
+
+    max_rejecting = 4
+    """Maximum number of association requests that are rejected concurrently"""
+
+    reuse_port = False
+    """If ``True`` listening socket is bound with ``SO_REUSEPORT`` (where supported).
+
+    This allows several AE processes to listen on the same port, with the kernel
+    distributing incoming associations between them.
     """
 
     def __init__(self, ae_title, port, supported_ts=None, max_pdu_length=65536,
-                 bind_and_activate=True):
+                 bind_and_activate=True, max_associations=25, *, tcp_nodelay=True,
+                 recv_buffer_size=None, send_buffer_size=None):
         """Initializes new AE instance."""
-        AEBase.__init__(self, supported_ts, max_pdu_length)
-        socketserver.ThreadingTCPServer.__init__(
+        if max_associations < 1:
+            raise ValueError(
+                'max_associations must be at least 1, got {0}'.format(max_associations)
+            )
+        AEBase.__init__(self, supported_ts, max_pdu_length, tcp_nodelay=tcp_nodelay,
+                        recv_buffer_size=recv_buffer_size, send_buffer_size=send_buffer_size)
+
+        # Socket pair is used to wake up serving loop when shutdown is requested
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._shutdown_requested = False
+        self._is_shut_down = threading.Event()
+
+        socketserver.TCPServer.__init__(
             self,
             ('', port),
             partial(asceprovider.AssociationAcceptor, max_pdu_length=self.max_pdu_length),
             bind_and_activate
         )
 
-        self.daemon_threads = True
-        self.allow_reuse_address = True
+        self.max_associations = max_associations
+        self._pool = _WorkerPool(max_associations)
+        self._free_workers = threading.BoundedSemaphore(max_associations)
+        self._reject_pool = _WorkerPool(self.max_rejecting)
+        self._free_rejecters = threading.BoundedSemaphore(self.max_rejecting)
         self.activted = bind_and_activate
 
-        self.local_ae = {'address': platform.node(), 'port': port,
+        self.local_ae = {'address': _NODE, 'port': port,
                          'aet': ae_title}
 
     def add_scp(self, service):
@@ -397,18 +546,98 @@ class AE(AEBase, socketserver.ThreadingTCPServer):
 
         :param service: DICOM service.
         """
-        self.supported_scp.update({
-            uid: service for uid in service.sop_classes
-        })
-        store_in_file = (hasattr(service, 'store_in_file') and
-                         service.store_in_file)
-        self.update_context_def_list(service.sop_classes, store_in_file)
+        self._add_service(self.supported_scp, service, service.sop_classes)
         return self
 
+    def server_bind(self):
+        """Binds listening socket, optionally enabling ``SO_REUSEPORT``.
+
+        Socket buffers are configured here, so that accepted connections inherit them.
+        """
+        if self.reuse_port and hasattr(socket, 'SO_REUSEPORT'):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        self.configure_socket(self.socket)
+        socketserver.TCPServer.server_bind(self)
+
+    def process_request(self, request, client_address):
+        """Hands over incoming connection to a worker thread from the pool.
+
+        If all workers are busy, association request is rejected by the rejection pool
+        instead of being queued. If rejection pool is busy too, connection is closed.
+        """
+        # Semaphores are released by the worker threads once request is handled
+        # pylint: disable=consider-using-with
+        if self._free_workers.acquire(blocking=False):
+            self._pool.submit(self._process_request, request, client_address)
+        elif self._free_rejecters.acquire(blocking=False):
+            self._reject_pool.submit(self._reject_request, request, client_address)
+        else:
+            self.shutdown_request(request)
+
+    def _process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:  # pylint: disable=broad-except
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._free_workers.release()
+
+    def _reject_request(self, request, _client_address):
+        try:
+            request.settimeout(self.timeout)
+            request.sendall(_BUSY_REJECT)
+            request.shutdown(socket.SHUT_WR)
+            # wait for the peer to close connection, so reject is not lost to a reset
+            while request.recv(4096):
+                pass
+        except OSError:
+            pass
+        finally:
+            self.shutdown_request(request)
+            self._free_rejecters.release()
+
+    def serve_forever(self, poll_interval=None):
+        """Handles incoming connections until shutdown is requested.
+
+        Unlike base class implementation method does not periodically wake up to check for
+        shutdown request, instead :meth:`shutdown` wakes it up.
+
+        :param poll_interval: ignored, kept for compatibility with the base class
+        """
+        self._is_shut_down.clear()
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(self, selectors.EVENT_READ)
+                selector.register(self._wakeup_r, selectors.EVENT_READ)
+                while not self._shutdown_requested:
+                    for key, _ in selector.select():
+                        if key.fileobj is self._wakeup_r:
+                            self._wakeup_r.recv(4096)
+                        elif not self._shutdown_requested:
+                            self._handle_request_noblock()
+                    self.service_actions()
+        finally:
+            self._shutdown_requested = False
+            self._is_shut_down.set()
+
+    def shutdown(self):
+        """Stops serving loop and waits until it exits."""
+        self._shutdown_requested = True
+        self._wakeup_w.send(b'\0')
+        self._is_shut_down.wait()
+
+    def server_close(self):
+        socketserver.TCPServer.server_close(self)
+        self._wakeup_r.close()
+        self._wakeup_w.close()
+
     def quit(self):
         """Stops AE from accepting any more connections."""
         self.shutdown()
         self.server_close()
+        self._pool.shutdown()
+        self._reject_pool.shutdown()
 
     def __enter__(self):
         if not self.activted:
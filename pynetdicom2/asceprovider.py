@@ -20,16 +20,13 @@ Each association class is not only responsible for initial establishment, but al
 association life-cycle until it's either released or aborted.
 """
 
-from __future__ import absolute_import, unicode_literals
-
 # This module provides association services
 import collections
 import functools
 from itertools import chain
-import time
+import socket
+import socketserver
 
-import six
-from six.moves import socketserver, range  # type: ignore
 from pydicom import uid
 
 from . import exceptions
@@ -47,6 +44,17 @@ PContextDef = collections.namedtuple(
 APPLICATION_CONTEXT_NAME = uid.UID('1.2.840.10008.3.1.1.1')
 IMPLEMENTATION_UID = uid.UID('1.2.826.0.1.3680043.8.498.1.1.155105445218102811803000')
 
+_APPLICATION_CONTEXT_ITEM = pdu.ApplicationContextItem(APPLICATION_CONTEXT_NAME)
+
+# Maps PDU types, that terminate or refuse association, to exception factories
+_PDU_ERRORS = {
+    pdu.AReleaseRqPDU.pdu_type: lambda dul_msg: exceptions.AssociationReleasedError(),
+    pdu.AAbortPDU.pdu_type: lambda dul_msg: exceptions.AssociationAbortedError(
+        dul_msg.source, dul_msg.reason_diag),
+    pdu.AAssociateRjPDU.pdu_type: lambda dul_msg: exceptions.AssociationRejectedError(
+        dul_msg.result, dul_msg.source, dul_msg.reason_diag)
+}
+
 
 def build_pres_context_def_list(context_def_list):
     """Builds a list of Presntation Context Items
@@ -58,17 +66,33 @@ def build_pres_context_def_list(context_def_list):
     return (
         pdu.PresentationContextItemRQ(
             pc_id, pdu.AbstractSyntaxSubItem(ctx.sop_class),
-            [pdu.TransferSyntaxSubItem(i) for i in ctx.supported_ts]
+            _transfer_syntax_sub_items(ctx.supported_ts)
         )
-        for pc_id, ctx in six.iteritems(context_def_list)
+        for pc_id, ctx in context_def_list.items()
     )
 
 
+def _transfer_syntax_sub_items(supported_ts):
+    # Sub-items are only read when request is encoded, so they are shared between all
+    # presentation contexts with the same set of transfer syntaxes
+    if not isinstance(supported_ts, (frozenset, tuple)):
+        supported_ts = tuple(supported_ts)  # keep order of user provided list
+    return _cached_transfer_syntax_sub_items(supported_ts)
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_transfer_syntax_sub_items(supported_ts):
+    return tuple(pdu.TransferSyntaxSubItem(ts) for ts in supported_ts)
+
+
 class Association(object):
     """Base association class.
 
     Class is not intended for direct usage and meant to be sub-classed.
     Class provides basic association interface: creation, release and abort.
+
+    :ivar timeout: timeout for receiving messages, taken from local AE when
+                   association is created.
     """
 
     def __init__(self, local_ae, dul_socket, max_pdu_length):
@@ -81,10 +105,12 @@ class Association(object):
         """
         self.ae = local_ae
         self.dul = dulprovider.DULServiceProvider(
-            self.ae.store_in_file, self.ae.get_file, dul_socket, max_pdu_length
+            self.ae.store_in_file, self.ae.get_file, dul_socket, max_pdu_length,
+            self.ae.configure_socket
         )
         self.association_established = False
         self.max_pdu_length = max_pdu_length
+        self.timeout = local_ae.timeout
         self.accepted_contexts = {}
 
     def send(self, dimse_msg, pc_id):
@@ -112,10 +138,7 @@ class Association(object):
         In most cases you won't need to use this method directly. Refer to
         release and abort instead.
         """
-        for _ in range(1000):
-            if self.dul.stop():
-                continue
-            time.sleep(0.001)
+        self.dul.stop(1)
         self.dul.kill()
         self.association_established = False
 
@@ -125,13 +148,13 @@ class Association(object):
         Requests the release of the association and waits for
         confirmation
         """
-        self.dul.send(pdu.AReleaseRqPDU())
-        rsp = self.dul.receive(self.ae.timeout)
+        self.dul.send(pdu.A_RELEASE_RQ)
+        rsp = self.dul.receive(self.timeout)
         self.kill()
         return rsp
 
     def _get_dul_message(self):
-        dul_msg = self.dul.receive(self.ae.timeout)
+        dul_msg = self.dul.receive(self.timeout)
         if isinstance(dul_msg, tuple):
             return dul_msg
         self._handle_errors(dul_msg)
@@ -139,13 +162,9 @@ class Association(object):
 
     @staticmethod
     def _handle_errors(dul_msg):
-        if dul_msg.pdu_type == pdu.AReleaseRqPDU.pdu_type:
-            raise exceptions.AssociationReleasedError()
-        if dul_msg.pdu_type == pdu.AAbortPDU.pdu_type:
-            raise exceptions.AssociationAbortedError(dul_msg.source, dul_msg.reason_diag)
-        if dul_msg.pdu_type == pdu.AAssociateRjPDU.pdu_type:
-            raise exceptions.AssociationRejectedError(
-                dul_msg.result, dul_msg.source, dul_msg.reason_diag)
+        error = _PDU_ERRORS.get(dul_msg.pdu_type)
+        if error is not None:
+            raise error(dul_msg)
 
 
 class AssociationAcceptor(socketserver.StreamRequestHandler, Association):
@@ -154,6 +173,11 @@ class AssociationAcceptor(socketserver.StreamRequestHandler, Association):
     Class is intended for handling incoming association requests.
     """
 
+    @property
+    def disable_nagle_algorithm(self):
+        """Nagle's algorithm is disabled according to local AE ``tcp_nodelay`` setting"""
+        return self.ae.tcp_nodelay
+
     def __init__(self, request, client_address, local_ae, max_pdu_length):
         """Initializes AssociationAcceptor instance with specified client socket
 
@@ -162,11 +186,16 @@ class AssociationAcceptor(socketserver.StreamRequestHandler, Association):
         """
         Association.__init__(self, local_ae, request, max_pdu_length)
         self.is_killed = False
-        self.sop_classes_as_scp = {}
+        self.sop_classes_as_scp = self.accepted_contexts  # kept for backward compatibility
         self.remote_ae = b''
 
         socketserver.StreamRequestHandler.__init__(self, request, client_address, local_ae)
 
+    def setup(self):
+        super(AssociationAcceptor, self).setup()
+        # detect peers that disappeared without closing connection
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
     def kill(self):
         """Overrides base class kill method to set stop-flag for running thread
 
@@ -197,17 +226,17 @@ class AssociationAcceptor(socketserver.StreamRequestHandler, Association):
         """Waits for an association request from a remote AE. Upon reception
         of the request sends association response based on
         acceptable_pr_contexts"""
-        user_items = assoc_req.variable_items[-1]
+        user_items = assoc_req.user_information
         max_pdu_sub_item = user_items.user_data[0]
         if self.max_pdu_length > max_pdu_sub_item.maximum_length_received:
             self.max_pdu_length = max_pdu_sub_item.maximum_length_received
         max_pdu_sub_item.maximum_length_received = self.max_pdu_length
 
         # analyse proposed presentation contexts
-        rsp = [assoc_req.variable_items[0]]
+        rsp = [assoc_req.application_context]
         requested = (
             (item.context_id, item.abs_sub_item.name, item.ts_sub_items)
-            for item in assoc_req.variable_items[1:-1]
+            for item in assoc_req.presentation_contexts
         )
 
         for pc_id, proposed_sop, proposed_ts in requested:
@@ -219,9 +248,7 @@ class AssociationAcceptor(socketserver.StreamRequestHandler, Association):
             for ts in proposed_ts:
                 if ts.name in self.ae.supported_ts:
                     rsp.append(pdu.PresentationContextItemAC(pc_id, 0, ts))
-                    ts_uid = uid.UID(ts.name)
-                    self.sop_classes_as_scp[pc_id] = (pc_id, proposed_sop, ts_uid)
-                    self.accepted_contexts[pc_id] = PContextDef(pc_id, proposed_sop, ts_uid)
+                    self.accepted_contexts[pc_id] = PContextDef(pc_id, proposed_sop, ts.name)
                     break
             else:  # Refuse sop class because of TS not supported
                 rsp.append(
@@ -243,7 +270,7 @@ class AssociationAcceptor(socketserver.StreamRequestHandler, Association):
             self._establish()
             self._loop()
         except exceptions.AssociationReleasedError:
-            self.dul.send(pdu.AReleaseRpPDU())
+            self.dul.send(pdu.A_RELEASE_RP)
         except exceptions.AssociationAbortedError:
             pass  # TODO: Log abort
         except exceptions.DCMTimeoutError:
@@ -253,7 +280,7 @@ class AssociationAcceptor(socketserver.StreamRequestHandler, Association):
 
     def _establish(self):
         try:
-            assoc_req = self.dul.receive(self.ae.timeout)
+            assoc_req = self.dul.receive(self.timeout)
             self.ae.on_association_request(self, assoc_req)
         except exceptions.AssociationRejectedError as exc:
             self.reject(exc.result, exc.source, exc.diagnostic)
@@ -263,17 +290,17 @@ class AssociationAcceptor(socketserver.StreamRequestHandler, Association):
         self.association_established = True
 
     def _loop(self):
+        accepted_contexts = self.accepted_contexts
+        supported_scp = self.ae.supported_scp
         while not self.is_killed:
             dimse_msg, pc_id = self.receive()
             _uid = dimse_msg.sop_class_uid
-            try:
-                _, sop_class, ts = self.sop_classes_as_scp[pc_id]
-                service = self.ae.supported_scp[_uid]
-            except KeyError:
+            context = accepted_contexts.get(pc_id)
+            service = supported_scp.get(_uid)
+            if context is None or service is None:
                 raise exceptions.ClassNotSupportedError(
                     'SOP Class {0} not supported as SCP'.format(_uid))
-            else:
-                service(self, PContextDef(pc_id, sop_class, ts), dimse_msg)
+            service(self, context, dimse_msg)
 
 
 class AssociationRequester(Association):
@@ -284,7 +311,8 @@ class AssociationRequester(Association):
     :class:`~pynetdicom2.applicationentity.ClientAE`.
 
     :ivar context_def_list: presentation context definitions in a form of dict
-                            (PC ID -> Presentation Context)
+                            (PC ID -> Presentation Context). Dictionary is shared with
+                            local AE and is intended for **read-only** use.
     :ivar remote_ae: dictionary, containing remote AET, address, port and other information
     :ivar sop_classes_as_scu: dictionary which maps accepted SOP Classes to presentation contexts.
                               empty, until association is established.
@@ -292,14 +320,14 @@ class AssociationRequester(Association):
 
     def __init__(self, local_ae, max_pdu_length, remote_ae):
         super(AssociationRequester, self).__init__(local_ae, None, max_pdu_length)
-        self.context_def_list = local_ae.copy_context_def_list()
+        self.context_def_list, self._pres_context_items = local_ae.get_pres_context_items()
         self.remote_ae = remote_ae
         self.sop_classes_as_scu = {}
 
     def request(self):
         """Requests association with remote AET."""
         ext = [userdataitems.ScpScuRoleSelectionSubItem(uid, 0, 1)
-               for uid in self.ae.supported_scp.keys()]
+               for uid in self.ae.supported_scp]
         custom_items = self.remote_ae.get('user_data', [])
         response = self._request(
             self.ae.local_ae, self.remote_ae, users_pdu=ext+custom_items
@@ -320,15 +348,13 @@ class AssociationRequester(Association):
                                                    supported by association.
         :return: SCU function
         """
-        try:
-            pc_id, ts = self.sop_classes_as_scu[sop_class]
-            service = self.ae.supported_scu[sop_class]
-        except KeyError:
+        accepted = self.sop_classes_as_scu.get(sop_class)
+        service = self.ae.supported_scu.get(sop_class)
+        if accepted is None or service is None:
             raise exceptions.ClassNotSupportedError(
                 'SOP Class {} not supported as SCU'.format(sop_class)
             )
-        else:
-            return functools.partial(service, self, PContextDef(pc_id, sop_class, ts))
+        return functools.partial(service, self, self.accepted_contexts[accepted[0]])
 
     def abort(self, reason=0):
         """Aborts association with specified reason
@@ -368,8 +394,8 @@ class AssociationRequester(Association):
                     remote_ae['jwt'], user_identity_type=5))
 
         variable_items = list(chain(
-            [pdu.ApplicationContextItem(APPLICATION_CONTEXT_NAME)],
-            build_pres_context_def_list(self.context_def_list),
+            [_APPLICATION_CONTEXT_ITEM],
+            self._pres_context_items,
             [pdu.UserInformationItem(user_information)]
         ))
         assoc_rq = pdu.AAssociateRqPDU(
@@ -380,13 +406,13 @@ class AssociationRequester(Association):
         # FIXME pass parameter properly
         assoc_rq.called_presentation_address = (remote_ae['address'], remote_ae['port'])
         self.dul.send(assoc_rq)
-        response = self.dul.receive(self.ae.timeout)
+        response = self.dul.receive(self.timeout)
         self._handle_errors(response)
         if isinstance(response, tuple) or response.pdu_type != pdu.AAssociateAcPDU.pdu_type:
             return exceptions.AssociationError('Invalid repsonse')
 
         # Get maximum pdu length from answer
-        user_data = response.variable_items[-1].user_data
+        user_data = response.user_information.user_data
         try:
             max_pdu_length = user_data[0].maximum_length_received
             if max_pdu_length and self.max_pdu_length > max_pdu_length:
@@ -395,11 +421,11 @@ class AssociationRequester(Association):
             pass
 
         # Get accepted presentation contexts
-        accepted = (ctx for ctx in response.variable_items[1:-1] if ctx.result_reason == 0)
+        accepted = (ctx for ctx in response.presentation_contexts if ctx.result_reason == 0)
         for ctx in accepted:
             pc_id = ctx.context_id
-            sop_class = self.context_def_list[ctx.context_id].sop_class
-            ts_uid = uid.UID(ctx.ts_sub_item.name)
+            sop_class = self.context_def_list[pc_id].sop_class
+            ts_uid = ctx.ts_sub_item.name
             self.sop_classes_as_scu[sop_class] = (pc_id, ts_uid)
             self.accepted_contexts[pc_id] = PContextDef(pc_id, sop_class, ts_uid)
         self.dul.accepted_contexts = self.accepted_contexts
@@ -20,16 +20,20 @@ as they are described in PS3.7 Sections 9 (DIMSE-C) and 10 (DIMSE-N).
     message). With that said if you are using services from this library you
     should not worry about any kind of message validation.
 """
-from __future__ import absolute_import
-
-import struct
+import io
+import os
+import stat
 from typing import Iterator, Tuple, IO, Union
 
-from six.moves import range  # type: ignore
+from pydicom.datadict import dictionary_VR, tag_for_keyword
+from pydicom.dataelem import DataElement
 from pydicom.dataset import Dataset
+from pydicom.tag import BaseTag, Tag
 
 from . import dsutils
+from . import exceptions
 from . import pdu
+from . import pdvitems
 
 NO_DATASET = 0x0101
 
@@ -37,6 +41,12 @@ PRIORITY_LOW = 0x0002
 PRIORITY_MEDIUM = 0x0000
 PRIORITY_HIGH = 0x0001
 
+# file objects, that could be sent directly from their file descriptor
+_RAW_FILE_TYPES = (io.BufferedReader, io.BufferedRandom, io.FileIO)
+
+_COMMAND_FIELD = Tag(0x0000, 0x0100)
+_COMMAND_DATA_SET_TYPE = Tag(0x0000, 0x0800)
+
 
 def value_or_none(elem):
     """Gets element value or returns None, if element is None
@@ -61,9 +71,12 @@ def chunks(seq, size):
 
 
 def fragment(data_set, max_pdu_length, normal, last):
-    # type: (bytes,int,int,int) -> Iterator[Tuple[bytes,int]]
+    # type: (bytes,int,int,int) -> Iterator[Tuple[memoryview,int]]
     """Fragmets dataset byte stream into chunks
 
+    Chunks are views into the original byte stream, so no data is copied until
+    chunk is encoded.
+
     :param data_set: dataset bytes stream
     :type data_set: bytes
     :param max_pdu_length: maximum PDU length
@@ -72,14 +85,56 @@ def fragment(data_set, max_pdu_length, normal, last):
     :type normal: int
     :param last: last chunk code
     :type last: int
-    :yield: tuple of bytes: fragment and its code
-    :rtype: Tuple[bytes,int]
+    :yield: tuple of memoryview: fragment and its code
+    :rtype: Tuple[memoryview,int]
     """
     maxsize = max_pdu_length - 6
-    for chunk, has_next in chunks(data_set, maxsize):
+    for chunk, has_next in chunks(memoryview(data_set), maxsize):
         yield chunk, normal if has_next else last
 
 
+def fragment_file_regions(fp, size, max_pdu_length, normal, last):
+    # type: (IO[bytes],int,int,int,int) -> Iterator[Tuple[int,int,int]]
+    """Fragmets dataset from a file into regions, without reading the file.
+
+    Dataset starts at the current file position and ends at the end of the file.
+
+    :param fp: file object
+    :type fp: IO[bytes]
+    :param size: file size
+    :type size: int
+    :param max_pdu_length: maximum PDU length
+    :type max_pdu_length: int
+    :param normal: regular chunk code
+    :type normal: int
+    :param last: last chunk code
+    :type last: int
+    :yield: tuple of fragment offset, fragment length and its code
+    :rtype: Tuple[int,int,int]
+    """
+    maxsize = max_pdu_length - 6
+    for offset in range(fp.tell(), size, maxsize):
+        length = min(maxsize, size - offset)
+        yield offset, length, normal if offset + length < size else last
+
+
+def _value_items(pc_id, fragments):
+    return (
+        pdvitems.BufferPresentationDataValueItem(pc_id, bit, item)
+        for item, bit in fragments
+    )
+
+
+def _regular_file_size(fp):
+    if not isinstance(fp, _RAW_FILE_TYPES):
+        return None  # wrapper (e.g. gzip), its file descriptor doesn't hold dataset bytes
+    try:
+        file_stat = os.fstat(fp.fileno())
+    except (AttributeError, EnvironmentError, ValueError):
+        return None  # not a file object
+    return file_stat.st_size if stat.S_ISREG(file_stat.st_mode) else None
+
+
 def fragment_file(fp, max_pdu_length, normal, last):
     # type: (IO[bytes],int,int,int) -> Iterator[Tuple[bytes,int]]
     """Fragmets dataset from a file-like object into chunks
@@ -107,12 +162,47 @@ def fragment_file(fp, max_pdu_length, normal, last):
         yield chunk, normal if has_next else last
 
 
+def _encode_pdus(encoded_command_set, data_set, pc_id, max_pdu_length):
+    # fragment command set
+    for item, bit in fragment(encoded_command_set, max_pdu_length, 1, 3):
+        # send only one pdv per p-data primitive
+        value_item = pdvitems.BufferPresentationDataValueItem(pc_id, bit, item)
+        yield pdu.PDataTfPDU([value_item])
+
+    # fragment data set
+    if data_set:
+        is_file = not isinstance(data_set, bytes)
+        if not is_file:
+            # got dataset as byte array
+            value_items = _value_items(pc_id, fragment(data_set, max_pdu_length, 0, 2))
+        else:
+            # assume that dataset is in file-like object
+            size = _regular_file_size(data_set)
+            if size is None:
+                value_items = _value_items(pc_id, fragment_file(data_set, max_pdu_length, 0, 2))
+            else:
+                # dataset is in a regular file, fragments are read when PDU is sent
+                value_items = (
+                    pdvitems.FilePresentationDataValueItem(pc_id, bit, data_set, offset, length)
+                    for offset, length, bit in fragment_file_regions(
+                        data_set, size, max_pdu_length, 0, 2
+                    )
+                )
+        try:
+            for value_item in value_items:
+                yield pdu.PDataTfPDU([value_item])
+        finally:
+            if is_file:
+                data_set.close()  # type: ignore
+
+
 def dimse_property(tag):
     """Creates property for DIMSE message using specified attribute tag
 
     :param tag: tuple with group and element numbers
     :return: property that gets/sets value in command dataset
     """
+    tag = Tag(tag)  # converted once, so dataset lookups skip tag parsing
 
     def setter(self, value):
         self.command_set[tag].value = value
@@ -146,6 +236,19 @@ class DIMSEMessage(object):
     command_field = None
     command_fields = []
 
+    @classmethod
+    def _get_command_elements(cls):
+        # type: () -> Tuple[Tuple[BaseTag,str],...]
+        """Returns (tag, VR) pairs of `command_fields`, resolved once per message class"""
+        elements = cls.__dict__.get('_command_elements')
+        if elements is None:
+            elements = tuple(
+                (Tag(tag_for_keyword(field)), dictionary_VR(field))
+                for field in cls.command_fields
+            )
+            cls._command_elements = elements
+        return elements
+
     def __init__(self, command_set=None):
         # type: (Union[Dataset,None]) -> None
         self._data_set = None
@@ -153,10 +256,10 @@ class DIMSEMessage(object):
             self.command_set = command_set
         else:
             self.command_set = Dataset()
-            self.command_set.CommandField = self.command_field
-            self.command_set.CommandDataSetType = NO_DATASET
-            for field in self.command_fields:
-                setattr(self.command_set, field, '')
+            self.command_set.add(DataElement(_COMMAND_FIELD, 'US', self.command_field))
+            self.command_set.add(DataElement(_COMMAND_DATA_SET_TYPE, 'US', NO_DATASET))
+            for tag, value_repr in self._get_command_elements():
+                self.command_set.add(DataElement(tag, value_repr, ''))
 
     sop_class_uid = dimse_property((0x0000, 0x0002))
 
@@ -175,44 +278,25 @@ class DIMSEMessage(object):
         # type: (int,int) -> Iterator[pdu.PDataTfPDU]
         """Returns the encoded message as a series of P-DATA-TF PDU objects.
 
+        Command set is encoded right away, so message object could be modified (and
+        reused) while returned PDUs are still being sent.
+
         :param pc_id: Presentation Context ID
         :type pc_id: int
         :param max_pdu_length: maximum PDU length
         :type max_pdu_length: int
-        :yield: P-DATA-TF PDUs
-        :rtype: pdu.PDataTfPDU
+        :return: P-DATA-TF PDUs iterator
+        :rtype: Iterator[pdu.PDataTfPDU]
         """
-        encoded_command_set = dsutils.encode(self.command_set, True, True)
-
-        # fragment command set
-        for item, bit in fragment(encoded_command_set, max_pdu_length, 1, 3):
-            # send only one pdv per p-data primitive
-            value_item = pdu.PresentationDataValueItem(pc_id, struct.pack('b', bit) + item)
-            yield pdu.PDataTfPDU([value_item])
-
-        # fragment data set
-        if self.data_set:
-            if isinstance(self.data_set, bytes):
-                # got dataset as byte array
-                is_file = False
-                gen = fragment(self.data_set, max_pdu_length, 0, 2)
-            else:
-                # assume that dataset is in file-like object
-                is_file = True
-                gen = fragment_file(self.data_set, max_pdu_length, 0, 2)
-            try:
-                for item, bit in gen:
-                    value_item = pdu.PresentationDataValueItem(pc_id, struct.pack('b', bit) + item)
-                    yield pdu.PDataTfPDU([value_item])
-            finally:
-                if is_file:
-                    self.data_set.close()  # type: ignore
+        encoded_command_set = dsutils.encode_command_set(self.command_set)
+        return _encode_pdus(encoded_command_set, self.data_set, pc_id, max_pdu_length)
 
     def set_length(self):
         """Sets DIMSE message length attribute in command dataset"""
-        it = (len(dsutils.encode_element(v, True, True))
-              for v in list(self.command_set.values())[1:])
-        self.command_set[(0x0000, 0x0000)].value = sum(it)
+        group_length = self.command_set[(0x0000, 0x0000)]
+        group_length.value = 0
+        # Command Group Length itself is encoded first: tag, length and UL value
+        group_length.value = len(dsutils.encode_command_set(self.command_set)) - 12
 
     def __repr__(self):
         return str(self.command_set) + '\n'
@@ -812,3 +896,22 @@ MESSAGE_TYPE = {
     0x0150: NDeleteRQMessage,
     0x8150: NDeleteRSPMessage
 }
+
+
+def message_from_command_set(command_set):
+    # type: (Dataset) -> DIMSEMessage
+    """Creates DIMSE message of the type specified by command set's Command Field
+
+    :param command_set: decoded command set
+    :type command_set: Dataset
+    :raises exceptions.DIMSEProcessingError: raised if Command Field value is unknown
+    :return: DIMSE message instance
+    :rtype: DIMSEMessage
+    """
+    command_field = command_set[(0x0000, 0x0100)].value
+    msg_type = MESSAGE_TYPE.get(command_field)
+    if msg_type is None:
+        raise exceptions.DIMSEProcessingError(
+            'Unknown command field: 0x{0:04X}'.format(command_field)
+        )
+    return msg_type(command_set)
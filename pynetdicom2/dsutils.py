@@ -8,15 +8,17 @@
 Helper module that provides function for converting datasets or dataset elements into
 bytes and back.
 """
+import struct
+from io import BytesIO
+
 import pydicom  # pylint: disable=unused-import
 from pydicom import filebase
 from pydicom import filereader
 from pydicom import filewriter
-import six
-if six.PY3:
-    from six import BytesIO as cStringIO
-else:
-    from six.moves import cStringIO  # type: ignore
+
+_ELEMENT_HEADER = struct.Struct('<HHI')
+_INT_STRUCTS = {'US': struct.Struct('<H'), 'UL': struct.Struct('<L')}
+_TEXT_PADDING = {'UI': b'\x00', 'AE': b' ', 'CS': b' ', 'LO': b' ', 'SH': b' '}
 
 
 def decode(rawstr, is_implicit_vr, is_little_endian):
@@ -32,7 +34,7 @@ def decode(rawstr, is_implicit_vr, is_little_endian):
     :return: decoded dataset
     :rtype: pydicom.Dataset
     """
-    fp = cStringIO(rawstr)  # type: ignore
+    fp = BytesIO(rawstr)
     return filereader.read_dataset(fp, is_implicit_vr, is_little_endian)
 
 
@@ -78,3 +80,50 @@ def encode_element(elem, is_implicit_vr, is_little_endian):
     rawstr = fp.parent.getvalue()
     fp.close()
     return rawstr
+
+
+def encode_command_set(ds):
+    # type: (pydicom.Dataset) -> bytes
+    """Encodes DIMSE command set into raw bytes
+
+    Command sets are always encoded in Implicit VR Little Endian and consist of a
+    handful of integer and text elements, so those are packed directly, without going
+    through generic pydicom writer. Elements of any other VR are encoded by
+    :func:`encode_element`.
+
+    :param ds: command set to encode
+    :type ds: pydicom.Dataset
+    :return: command set encoded into raw bytes
+    :rtype: bytes
+    """
+    encoded = bytearray()
+    for elem in ds:
+        value = elem.value
+        value_repr = elem.VR
+        if value_repr in _INT_STRUCTS:
+            int_struct = _INT_STRUCTS[value_repr]
+            if value is None or value == '':
+                value = b''
+            elif isinstance(value, int):
+                value = int_struct.pack(value)
+            else:
+                value = b''.join([int_struct.pack(v) for v in value])
+        elif value_repr in _TEXT_PADDING:
+            if value is None:
+                value = ''
+            elif not isinstance(value, str):
+                value = '\\'.join(value)
+            try:
+                value = value.encode('ascii')
+            except UnicodeEncodeError:
+                # let pydicom deal with character sets
+                encoded += encode_element(elem, True, True)
+                continue
+            if len(value) % 2:
+                value += _TEXT_PADDING[value_repr]
+        else:
+            encoded += encode_element(elem, True, True)
+            continue
+        encoded += _ELEMENT_HEADER.pack(elem.tag.group, elem.tag.element, len(value))
+        encoded += value
+    return bytes(encoded)
@@ -8,7 +8,7 @@
 """
 This module implements the DUL service provider, allowing a DUL service user to
 send and receive DUL messages (PDUs).  The User and Provider talk to each
-other using a TCP socket. The DULServer runs in a thread, polling TCP socket
+other using a TCP socket. The DULServer runs in a thread, waiting on TCP socket
 for incoming messages and sending messages from user queue.
 Underlying logic of the service is implemented via state machine that is
 described in DICOM standard.
@@ -19,25 +19,39 @@ use higher level objects like sub-classes of
 :class:`~pynetdicom2.asceprovider.Association` or various services.
 """
 
-from __future__ import absolute_import
-
 import collections
 
 import threading
-from typing import FrozenSet  # pylint: disable=unused-import
+from typing import FrozenSet, Optional  # pylint: disable=unused-import
 import time
 import socket
 import select
 import struct
 
-import six
-from six.moves import queue  # type: ignore
-
 from . import fsm
 from . import pdu
 from . import exceptions
 
 
+_PDU_LENGTH = struct.Struct('>L')
+
+
+if hasattr(select, 'poll'):
+    def _wait_readable(sockets, timeout):
+        # poll is not limited by FD_SETSIZE, so it keeps working when process has a lot of
+        # open associations
+        poller = select.poll()
+        by_fd = {}
+        for sock in sockets:
+            by_fd[sock.fileno()] = sock
+            poller.register(sock, select.POLLIN)
+        if timeout is not None:
+            timeout *= 1000
+        return [by_fd[fd] for fd, _ in poller.poll(timeout)]
+else:
+    def _wait_readable(sockets, timeout):
+        return select.select(sockets, [], [], timeout)[0]
+
 PDU_TYPES = {
     0x01: (pdu.AAssociateRqPDU, fsm.Events.EVT_6),
     0x02: (pdu.AAssociateAcPDU, fsm.Events.EVT_3),
@@ -77,7 +91,8 @@ class DULServiceProvider(threading.Thread):
     :ivar event: current event
     :ivar max_pdu_length: maximum PDU length for incoming P-DATA-TF PDUs
     :ivar to_service_user: outgoing data queue
-    :ivar from_service_user: incoming data queue
+                           (:class:`~pynetdicom2.dulprovider.MessageQueue`)
+    :ivar from_service_user: incoming data queue (``collections.deque``)
     :ivar dul_socket: socket, that service uses
     :ivar is_killed: DUL service termination flag
     """
@@ -87,7 +102,8 @@ class DULServiceProvider(threading.Thread):
             store_in_file,  # type: FrozenSet[str]
             get_file_cb,
             dul_socket=None,  # type: socket.socket
-            max_pdu_length=65536  # type: int
+            max_pdu_length=65536,  # type: int
+            configure_socket_cb=None
         ):
         """Initializes DUL service.
 
@@ -100,6 +116,9 @@ class DULServiceProvider(threading.Thread):
         :param get_file_cb: callback for getting a file to store incoming dataset
         :param dul_socket: remote client socket that will be used to send and
                            receive PDUs.
+        :param max_pdu_length: maximum PDU length
+        :param configure_socket_cb: callback for setting up TCP options of the client socket
+                                    opened by the service
         """
         super(DULServiceProvider, self).__init__()
 
@@ -108,19 +127,28 @@ class DULServiceProvider(threading.Thread):
         self.event = collections.deque()
         self.max_pdu_length = max_pdu_length
 
-        self.to_service_user = queue.Queue()
-        self.from_service_user = queue.Queue()
+        self.to_service_user = MessageQueue()
+        self.from_service_user = collections.deque()  # only DUL thread takes items from it
 
         # Setup the timer and finite state machines
         self.timer = Timer(10)
-        self.state_machine = fsm.StateMachine(self, self.timer, store_in_file, get_file_cb)
+        self.state_machine = fsm.StateMachine(self, self.timer, store_in_file, get_file_cb,
+                                              configure_socket_cb)
         self._is_killed = threading.Event()
+        self._is_idle = threading.Event()
 
         if dul_socket:  # A client socket has been given. Generate an event 5
             self.event.append(fsm.Events.EVT_5)
+        else:
+            self._is_idle.set()
 
         self.dul_socket = dul_socket
-        self.raw_pdu = b''
+        self.raw_pdu = bytearray()  # incoming data, that is not yet decoded into PDUs
+
+        # Socket pair is used to wake up event loop, when it's waiting for
+        # incoming data and something is put into outgoing queue.
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_w.setblocking(False)
 
         self.is_killed = False
         self.start()
@@ -144,7 +172,8 @@ class DULServiceProvider(threading.Thread):
 
         :param primitive: outgoing PDU. Possible PDU types are described in :doc:`pdu`
         """
-        self.from_service_user.put(primitive)
+        self.from_service_user.append(primitive)
+        self._wakeup()
 
     def receive(self, timeout):
         """Tries to get PDU from incoming queue.
@@ -158,45 +187,71 @@ class DULServiceProvider(threading.Thread):
                  described in :doc:`dimsemessages`.
         :raise exceptions.DCMTimeoutError: If specified timeout is exceeded
         """
-        try:
-            return self.to_service_user.get(timeout=timeout)
-        except queue.Empty:
-            raise exceptions.DCMTimeoutError()
+        return self.to_service_user.get(timeout)
 
-    def stop(self):
+    def stop(self, timeout=None):
         """Tries to stop service for idle association.
 
         If association is not in idle state, method will return ``False`` and
         association will not be stopped.
 
+        :param timeout: number of seconds to wait for association to become idle.
+                        By default method does not wait.
         :return: ``True`` if service termination flag was successfully set
                  (current association state was 'idle'), ``False`` otherwise
         """
+        if timeout:
+            self._is_idle.wait(timeout)
         if self.state_machine.current_state == fsm.States.STA_1:
             self.is_killed = True
+            self._wakeup()
             return True
         return False
 
     def kill(self):
         """Sets termination flag for event loop and waits for thread to exit."""
         self.is_killed = True
+        self._wakeup()
         self._is_killed.wait()
 
     def run(self):
         try:
             while not self.is_killed:
-                self._check_network() or self._check_outgoing_pdu() or self._check_timer()  # pylint: disable=expression-not-assigned
+                if not (self._check_network() or self._check_outgoing_pdu() or
+                        self._check_timer() or self.event):
+                    self._wait()
+                    continue
                 try:
                     evt = self.event.popleft()
                 except IndexError:
                     continue
                 self.state_machine.action(evt)
+                if self.state_machine.current_state == fsm.States.STA_1:
+                    self._is_idle.set()
+                else:
+                    self._is_idle.clear()
         except Exception:
             self.to_service_user.put(pdu.AAbortPDU(source=0, reason_diag=0))
             raise
         finally:
+            self._wakeup_r.close()
+            self._wakeup_w.close()
+            self._is_idle.set()
             self._is_killed.set()
 
+    def _wakeup(self):
+        try:
+            self._wakeup_w.send(b'\0')
+        except socket.error:
+            pass  # event loop is either already awake or stopped
+
+    def _wait(self):
+        """Blocks until there is incoming data, outgoing PDU or timer expires."""
+        sockets = [self._wakeup_r, self.dul_socket] if self.dul_socket else [self._wakeup_r]
+        readable = _wait_readable(sockets, self.timer.remaining())
+        if self._wakeup_r in readable:
+            self._wakeup_r.recv(4096)
+
     def _check_network(self):
         if self.state_machine.current_state == fsm.States.STA_13:
             return self._close()
@@ -212,7 +267,7 @@ class DULServiceProvider(threading.Thread):
             return True
 
         # check if something comes in the client socket
-        if select.select([self.dul_socket], [], [], 0.05)[0]:
+        if _wait_readable([self.dul_socket], 0):
             if self._check_incoming_pdu():
                 return True
 
@@ -227,7 +282,10 @@ class DULServiceProvider(threading.Thread):
                     return True
                 except StopIteration:
                     self.dimse_gen = None
-            incoming = self.from_service_user.get(False, None)
+            try:
+                incoming = self.from_service_user.popleft()
+            except IndexError:
+                return False
             if hasattr(incoming, 'pdu_type'):
                 self.primitive = incoming
             else:
@@ -239,8 +297,6 @@ class DULServiceProvider(threading.Thread):
             raise exceptions.PDUProcessingError(
                 'Unknown PDU {0} with type {1}'.format(self.primitive, self.primitive.pdu_type)
             )
-        except queue.Empty:
-            return False
 
     def _check_timer(self):
         if self.timer.check() is False:
@@ -273,18 +329,19 @@ class DULServiceProvider(threading.Thread):
         if len(self.raw_pdu) < 6:
             return False
 
-        length = self.raw_pdu[2:6]
-        length = struct.unpack('>L', length)[0]
+        length = _PDU_LENGTH.unpack_from(self.raw_pdu, 2)[0]
         full_length = length + 6
         if len(self.raw_pdu) < full_length:
             return False
 
-        raw_pdu = self.raw_pdu[:full_length]
-        self.raw_pdu = self.raw_pdu[full_length:]
+        with memoryview(self.raw_pdu) as view:
+            raw_pdu = view[:full_length].tobytes()
+        # consumed bytes are dropped in place, without copying the rest of the buffer
+        del self.raw_pdu[:full_length]
 
         # Determine the type of PDU coming on remote port and set the event accordingly
         try:
-            pdu_type, event = PDU_TYPES[six.indexbytes(raw_pdu, 0)]
+            pdu_type, event = PDU_TYPES[raw_pdu[0]]
             self.primitive = pdu_type.decode(raw_pdu)
             self.event.append(event)
         except KeyError:
@@ -309,6 +366,48 @@ class DULServiceProvider(threading.Thread):
         return True
 
 
+class MessageQueue(object):
+    """Simple FIFO queue for passing incoming PDUs and DIMSE messages to service user.
+
+    Unlike ``queue.Queue`` it takes no locks when there is an item available, lock is only used
+    to wait for an item to arrive.
+    """
+
+    def __init__(self):
+        self._items = collections.deque()
+        self._not_empty = threading.Condition(threading.Lock())
+
+    def put(self, item):
+        """Puts item into the queue.
+
+        :param item: PDU or DIMSE message
+        """
+        self._items.append(item)
+        with self._not_empty:
+            self._not_empty.notify()
+
+    def get(self, timeout=None):
+        """Removes and returns an item from the queue, waiting if necessary.
+
+        :param timeout: the amount of seconds to wait for an item. Waits forever if ``None``.
+        :return: PDU or DIMSE message
+        :raise exceptions.DCMTimeoutError: If specified timeout is exceeded
+        """
+        try:
+            return self._items.popleft()
+        except IndexError:
+            pass
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._not_empty:
+            while not self._items:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise exceptions.DCMTimeoutError()
+                self._not_empty.wait(remaining)
+            return self._items.popleft()
+
+
 class Timer(object):
     """A small helper timer class"""
 
@@ -336,3 +435,10 @@ class Timer(object):
         if self._start_time and (time.time() - self._start_time > self._max_seconds):
             return False
         return True
+
+    def remaining(self):
+        # type: () -> Optional[float]
+        """Returns number of seconds until timer expires or ``None`` if timer is not set"""
+        if self._start_time is None:
+            return None
+        return max(self._start_time + self._max_seconds - time.time(), 0)
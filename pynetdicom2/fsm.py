@@ -9,20 +9,48 @@ Implementation of the OSI Upper Layer Services
 DICOM, Part 8, Section 7
 """
 
-from __future__ import absolute_import
-
 import socket
 
-from typing import Dict, Tuple, Callable
-import six
+from typing import Dict, Tuple, Callable, Optional
 
 from . import dimsemessages
 from . import dsutils
 from . import exceptions
 from . import pdu
+from . import pdvitems
+
+
+_MSG_MORE = getattr(socket, 'MSG_MORE', 0)  # hints kernel that PDV value follows the headers
+
+# A-RELEASE PDUs have no variable fields, so they are encoded only once
+_RELEASE_RQ_BYTES = pdu.A_RELEASE_RQ.encode()
+_RELEASE_RP_BYTES = pdu.A_RELEASE_RP.encode()
+
+
+def configure_socket(sock, tcp_nodelay=True, recv_buffer_size=None, send_buffer_size=None):
+    # type: (socket.socket, bool, Optional[int], Optional[int]) -> None
+    """Applies TCP options to the association socket.
+
+    Send and receive buffer sizes are set only when given explicitly: setting
+    ``SO_RCVBUF``/``SO_SNDBUF`` disables kernel auto-tuning for that buffer, which
+    usually grows buffers well past anything derived from PDU size.
+    Explicit sizes should be applied before connecting (or listening), since TCP window
+    scale is negotiated during handshake.
+
+    :param sock: TCP socket
+    :param tcp_nodelay: if ``True`` Nagle's algorithm is disabled
+    :param recv_buffer_size: explicit ``SO_RCVBUF`` size
+    :param send_buffer_size: explicit ``SO_SNDBUF`` size
+    """
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, int(tcp_nodelay))
+    if recv_buffer_size:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, recv_buffer_size)
+    if send_buffer_size:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, send_buffer_size)
 
 
-# TODO Make into enum after dropping Py2 support
+# Plain integers rather than enum members: states are looked up in the
+# transition table on every event
 class States(object):  # pylint: disable=too-few-public-methods
     """Services states enumeration."""
 
@@ -73,7 +101,7 @@ class States(object):  # pylint: disable=too-few-public-methods
     """Awaiting Transport Connection Close Indication (Association no longer exists)"""
 
 
-# TODO Make into enum after dropping Py2 support
+# Plain integers for the same reason as ``States``
 class Events(object):  # pylint: disable=too-few-public-methods
     """Events enumeration."""
 
@@ -144,20 +172,23 @@ class StateMachine(object):  # pylint: disable=too-many-public-methods
     :ivar store_in_file: set of SOP Class UIDs, for which incoming datasets should be stored in
                          a file, rather than in-memory
     :ivar get_file_cb: callback for getting a file object for storage
+    :ivar configure_socket_cb: callback for setting up TCP options of the client socket
     :ivar accepted_contexts: accepted presentation contexts in current association
     :ivar dimse_decoder: decoder for incoming P-DATA-TF PDUs, used to re-create incoming DIMSE
                          message
     :ivar transition_table: state machine transition table
     """
-    def __init__(self, provider, timer, store_in_file, get_file_cb):
+    def __init__(self, provider, timer, store_in_file, get_file_cb, configure_socket_cb=None):
         self.current_state = States.STA_1
         self.provider = provider
         self.timer = timer
         self.store_in_file = store_in_file
         self.get_file_cb = get_file_cb
+        self.configure_socket_cb = configure_socket_cb or configure_socket
         self.accepted_contexts = {}
 
         self.dimse_decoder = None
+        self._pdu_buffer = bytearray()  # reused for encoding outgoing P-DATA-TF PDUs
 
         self.transition_table = {
             (Events.EVT_1, States.STA_1): self.ae_1,
@@ -336,6 +367,8 @@ class StateMachine(object):  # pylint: disable=too-many-public-methods
     def ae_1(self):
         """Issue TransportConnect request primitive to local transport service."""
         self.dul_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.dul_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        self.configure_socket_cb(self.dul_socket)
         self.dul_socket.connect(self.primitive.called_presentation_address)
         return States.STA_4
 
@@ -389,7 +422,7 @@ class StateMachine(object):  # pylint: disable=too-many-public-methods
 
     def dt_1(self):
         """Send P-DATA-TF PDU."""
-        self.dul_socket.sendall(self.primitive.encode())
+        self._send_p_data(self.primitive)
         self.primitive = None
         return States.STA_6
 
@@ -409,8 +442,8 @@ class StateMachine(object):  # pylint: disable=too-many-public-methods
 
     def ar_1(self):
         """Send A-RELEASE-RQ PDU."""
-        self.primitive = pdu.AReleaseRqPDU()
-        self.dul_socket.sendall(self.primitive.encode())
+        self.primitive = pdu.A_RELEASE_RQ
+        self.dul_socket.sendall(_RELEASE_RQ_BYTES)
         return States.STA_7
 
     def ar_2(self):
@@ -427,8 +460,8 @@ class StateMachine(object):  # pylint: disable=too-many-public-methods
 
     def ar_4(self):
         """Issue A-RELEASE-RP PDU and start ARTIM timer."""
-        self.primitive = pdu.AReleaseRpPDU()
-        self.dul_socket.sendall(self.primitive.encode())
+        self.primitive = pdu.A_RELEASE_RP
+        self.dul_socket.sendall(_RELEASE_RP_BYTES)
         self.timer.start()
         return States.STA_13
 
@@ -453,7 +486,7 @@ class StateMachine(object):  # pylint: disable=too-many-public-methods
 
     def ar_7(self):
         """Issue P-DATA-TF PDU."""
-        self.dul_socket.sendall(self.primitive.encode())
+        self._send_p_data(self.primitive)
         return States.STA_8
 
     def ar_8(self):
@@ -465,8 +498,8 @@ class StateMachine(object):  # pylint: disable=too-many-public-methods
 
     def ar_9(self):
         """Send A-RELEASE-RP PDU."""
-        self.primitive = pdu.AReleaseRpPDU()
-        self.dul_socket.sendall(self.primitive.encode())
+        self.primitive = pdu.A_RELEASE_RP
+        self.dul_socket.sendall(_RELEASE_RP_BYTES)
         return States.STA_11
 
     def ar_10(self):
@@ -540,6 +573,25 @@ class StateMachine(object):  # pylint: disable=too-many-public-methods
             self.timer.start()
         return States.STA_13
 
+    def _send_p_data(self, p_data):
+        # type: (pdu.PDataTfPDU) -> None
+        value_items = p_data.data_value_items
+        if len(value_items) == 1 and \
+                isinstance(value_items[0], pdvitems.FilePresentationDataValueItem):
+            # Send headers first and then let kernel copy PDV value directly from the file
+            item = value_items[0]
+            header = p_data.header.pack(p_data.pdu_type, p_data.reserved, p_data.pdu_length)
+            self.dul_socket.sendall(header + item.encode_header(), _MSG_MORE)
+            sent = self.dul_socket.sendfile(item.fp, item.offset, item.length)
+            if sent != item.length:
+                raise exceptions.PDUProcessingError(
+                    'File ended {0} bytes short of PDV value'.format(item.length - sent)
+                )
+            return
+
+        length = p_data.encode_into(self._pdu_buffer)
+        self.dul_socket.sendall(memoryview(self._pdu_buffer)[:length])
+
 
 class DIMSEDecoder(object):  # pylint: disable=too-few-public-methods
     """DIMSE Message decoder.
@@ -586,15 +638,16 @@ class DIMSEDecoder(object):  # pylint: disable=too-few-public-methods
         """Processes new incoming P-DATA-TF PDU
 
         :param p_data: incoming P-DATA-TF PDU
-        :raises exceptions.DIMSEProcessingError: raised if unknown PDV type is encountered
+        :raises exceptions.DIMSEProcessingError: raised if unknown PDV type or command field is
+                                                encountered
         """
         try:
             for value_item in p_data.data_value_items:
                 # must be able to read P-DATA with several PDVs
                 self.pc_id = value_item.context_id
-                marker = six.indexbytes(value_item.data_value, 0)
+                marker = value_item.data_value[0]
                 if marker in (1, 3):
-                    self._encoded_command_set.append(value_item.data_value[1:])
+                    self._encoded_command_set.append(memoryview(value_item.data_value)[1:])
                     if marker == 3:
                         self.command_set_received = True
                         command_set = dsutils.decode(
@@ -602,7 +655,7 @@ class DIMSEDecoder(object):  # pylint: disable=too-few-public-methods
                             True, True
                         )
 
-                        self.msg = self._command_set_to_message(command_set)
+                        self.msg = dimsemessages.message_from_command_set(command_set)
                         no_ds = command_set[(0x0000, 0x0800)].value == 0x0101
                         use_file = (self.msg.sop_class_uid in self.store_in_file)
                         if not no_ds and use_file:
@@ -614,10 +667,12 @@ class DIMSEDecoder(object):  # pylint: disable=too-few-public-methods
                             self.receiving = False  # response: no dataset
                             break
                 elif marker in (0, 2):
+                    # skip message control header without copying fragment
+                    fragment = memoryview(value_item.data_value)[1:]
                     if self._dataset_fp:
-                        self._dataset_fp.write(value_item.data_value[1:])
+                        self._dataset_fp.write(fragment)
                     else:
-                        self._encoded_data_set.append(value_item.data_value[1:])
+                        self._encoded_data_set.append(fragment)
                     if marker == 2:
                         self.data_set_received = True
                         if self.command_set_received:
@@ -636,10 +691,3 @@ class DIMSEDecoder(object):  # pylint: disable=too-few-public-methods
                 self.msg.data_set = self._dataset_fp
             else:
                 self.msg.data_set = b''.join(self._encoded_data_set)
-
-    @staticmethod
-    def _command_set_to_message(command_set):
-        command_field = command_set[(0x0000, 0x0100)].value
-        msg_type = dimsemessages.MESSAGE_TYPE[command_field]
-        msg = msg_type(command_set)
-        return msg
@@ -23,28 +23,25 @@ module. These classes are:
         * :class:`~pynetdicom2.pdu.TransferSyntaxSubItem`
         * :class:`~pynetdicom2.pdu.UserInformationItem`
         * :class:`~pynetdicom2.pdu.PresentationContextItemAC`
-        * :class:`~pynetdicom2.pdu.PresentationDataValueItem`
 
-The rest sub-items for User Data Information Item can be found at
+Presentation Data Value Items, that are carried by P-DATA-TF PDU, can be found at
+:doc:`pdvitems`. The rest sub-items for User Data Information Item can be found at
 :doc:`userdataitems`.
 """
 
-from __future__ import absolute_import
-
+from io import BytesIO
+import functools
 import struct
+from typing import Union  # pylint: disable=unused-import
 
-import six
 from pydicom import uid
 
 from . import exceptions
 from . import userdataitems
-
-# pylint: disable=ungrouped-imports
-if six.PY3:
-    from six import BytesIO as cStringIO
-else:
-    from six.moves import cStringIO  # type: ignore
-# pylint: enable=ungrouped-imports
+# items are re-exported here for backward compatibility
+from .pdvitems import (  # pylint: disable=unused-import
+    PresentationDataValueItem, BufferPresentationDataValueItem, FilePresentationDataValueItem
+)
 
 
 SUB_ITEM_TYPES = {
@@ -59,12 +56,22 @@ SUB_ITEM_TYPES = {
 }
 
 
+_ITEM_TYPE = struct.Struct('B')
+
+
+@functools.lru_cache(maxsize=512)
+def _decode_uid(raw):
+    # Peers keep sending the same few SOP Class and Transfer Syntax UIDs,
+    # so decoded values are cached rather than parsed on every association
+    return uid.UID(raw.decode())
+
+
 def _next_type(stream):
     char = stream.read(1)
     if char == b'':
         return None  # we are at the end of the file
     stream.seek(-1, 1)
-    return struct.unpack('B', char)[0]
+    return _ITEM_TYPE.unpack(char)[0]
 
 
 class AAssociatePDUBase(object):
@@ -72,7 +79,8 @@ class AAssociatePDUBase(object):
 
     :ivar called_ae_title: called AE Title (remote AET)
     :ivar calling_ae_title: calling AE Title (local AET)
-    :ivar variable_items: list of various variable items
+    :ivar variable_items: list of various variable items (application context item,
+                          presentation context items and user information item in that order)
     :ivar protocol_version: protocol version, should be 1
     :ivar reserved1: reserved field, defaults 0
     :ivar reserved2: reserved field, defaults 0
@@ -95,6 +103,30 @@ class AAssociatePDUBase(object):
         else:
             self.reserved3 = reserved3
 
+    @property
+    def application_context(self):
+        """Application Context Item
+
+        :rtype: ApplicationContextItem
+        """
+        return self.variable_items[0]
+
+    @property
+    def presentation_contexts(self):
+        """Presentation Context Items
+
+        :rtype: List[Union[PresentationContextItemRQ,PresentationContextItemAC]]
+        """
+        return self.variable_items[1:-1]
+
+    @property
+    def user_information(self):
+        """User Information Item
+
+        :rtype: UserInformationItem
+        """
+        return self.variable_items[-1]
+
     @property
     def pdu_length(self):
         """PDU length without the header
@@ -112,11 +144,12 @@ class AAssociatePDUBase(object):
         """
         called_ae_title = self.called_ae_title.encode()
         calling_ae_title = self.calling_ae_title.encode()
-        return self.header.pack(self.pdu_type, self.reserved1, self.pdu_length,
-                                self.protocol_version, self.reserved2,
-                                called_ae_title, calling_ae_title,
-                                *self.reserved3) \
-            + b''.join([item.encode() for item in self.variable_items])
+        encoded = [self.header.pack(self.pdu_type, self.reserved1, self.pdu_length,
+                                    self.protocol_version, self.reserved2,
+                                    called_ae_title, calling_ae_title,
+                                    *self.reserved3)]
+        encoded.extend(item.encode() for item in self.variable_items)
+        return b''.join(encoded)
 
     @classmethod
     def decode(cls, raw_bytes):
@@ -140,7 +173,7 @@ class AAssociatePDUBase(object):
                     raise exceptions.PDUProcessingError('Invalid variable item')
                 item_type = _next_type(stream)
 
-        stream = cStringIO(raw_bytes)
+        stream = BytesIO(raw_bytes)
         values = cls.header.unpack(stream.read(74))  # type: ignore
         _, reserved1, _, protocol_version, reserved2, \
             called_ae_title, calling_ae_title = values[:7]
@@ -254,7 +287,7 @@ class AAssociateRjPDU(object):
                           A-ASSOCIATE-RJ PDU
         :return: decoded PDU
         """
-        stream = cStringIO(rawstring)
+        stream = BytesIO(rawstring)
         _, reserved1, _, reserved2, result, source, \
             reason_diag = cls.format.unpack(stream.read(10))  # type: ignore
         return cls(result=result, source=source, reason_diag=reason_diag,
@@ -314,6 +347,27 @@ class PDataTfPDU(object):
         return self.header.pack(self.pdu_type, self.reserved, self.pdu_length)\
             + b''.join(item.encode() for item in self.data_value_items)
 
+    def encode_into(self, buffer):
+        """Encodes PDataTfPDU into provided buffer.
+
+        Buffer is extended if it's too small to hold encoded PDU, so the same buffer
+        could be reused for all outgoing P-DATA-TF PDUs.
+
+        :param buffer: buffer to encode PDU into
+        :type buffer: bytearray
+        :return: number of bytes written into the buffer
+        :rtype: int
+        """
+        pdu_length = self.pdu_length
+        total_length = 6 + pdu_length
+        if len(buffer) < total_length:
+            buffer.extend(bytearray(total_length - len(buffer)))
+        self.header.pack_into(buffer, 0, self.pdu_type, self.reserved, pdu_length)
+        offset = 6
+        for item in self.data_value_items:
+            offset = item.encode_into(buffer, offset)
+        return offset
+
     @classmethod
     def decode(cls, rawstring):
         """Factory method. Decodes P-DATA-TF PDU instance from raw string.
@@ -329,7 +383,7 @@ class PDataTfPDU(object):
                 length_read += item.total_length()
                 yield item
 
-        stream = cStringIO(rawstring)
+        stream = BytesIO(rawstring)
         _, reserved, pdu_length = cls.header.unpack(stream.read(6))  # type: ignore
         data_value_items = list(iter_items())
         return cls(data_value_items, reserved)
@@ -379,7 +433,7 @@ class AReleasePDUBase(object):
                           A-RELEASE-* PDU
         :return: decoded PDU
         """
-        stream = cStringIO(rawstring)
+        stream = BytesIO(rawstring)
         _, reserved1, _, reserved2 = cls.format.unpack(stream.read(10))  # type: ignore
         return cls(reserved1=reserved1, reserved2=reserved2)
 
@@ -415,6 +469,14 @@ class AReleaseRpPDU(AReleasePDUBase):
         return 'AReleaseRpPDU(reserved1={0}, reserved2={1})'.format(self.reserved1, self.reserved2)
 
 
+# A-RELEASE PDUs have no variable fields, so single instances are shared by all associations
+A_RELEASE_RQ = AReleaseRqPDU()
+"""Shared A-RELEASE-RQ PDU instance"""
+
+A_RELEASE_RP = AReleaseRpPDU()
+"""Shared A-RELEASE-RP PDU instance"""
+
+
 class AAbortPDU(object):
     """This class represents the A-ABORT PDU as described in PS 3.8 9.3.8
 
@@ -477,7 +539,7 @@ class AAbortPDU(object):
                           the A-ABORT PDU
         :return: decoded PDU
         """
-        stream = cStringIO(rawstring)
+        stream = BytesIO(rawstring)
         _, reserved1, _, reserved2, reserved3, abort_source, \
             reason_diag = cls.format.unpack(stream.read(10))  # type: ignore
         return cls(reserved1=reserved1, reserved2=reserved2,
@@ -774,7 +836,7 @@ class AbstractSyntaxSubItem(object):
         :return: decoded abstract syntax sub-item
         """
         _, reserved, item_length = cls.header.unpack(stream.read(4))
-        name = uid.UID(stream.read(item_length).decode())
+        name = _decode_uid(stream.read(item_length))
         return cls(name=name, reserved=reserved)
 
     def total_length(self):
@@ -800,7 +862,7 @@ class TransferSyntaxSubItem(object):
 
     def __init__(self, name, reserved=0x00):
         self.reserved = reserved  # unsigned byte
-        self.name = uid.UID(name)  # string
+        self.name = name if isinstance(name, uid.UID) else uid.UID(name)  # string
 
     def __repr__(self):
         return 'TransferSyntaxSubItem(name="{0}", reserved={1})'.format(self.name, self.reserved)
@@ -832,7 +894,7 @@ class TransferSyntaxSubItem(object):
         """
         _, reserved, item_length = cls.header.unpack(stream.read(4))
         name = stream.read(item_length)
-        return cls(name=name.decode(), reserved=reserved)
+        return cls(name=_decode_uid(name), reserved=reserved)
 
     def total_length(self):
         """Total item length, including the header
@@ -921,60 +983,3 @@ class UserInformationItem(object):
         :rtype: int
         """
         return 4 + self.item_length
-
-
-class PresentationDataValueItem(object):
-    """Presentation Data Value Item (PS 3.8 9.3.5.1)
-
-    :ivar context_id: presentation context ID
-    :ivar data_value: item value (bytes)
-    """
-    header = struct.Struct('>I B')
-
-    def __init__(self, context_id, data_value):
-        # type: (int,bytes) -> None
-        self.context_id = context_id  # unsigned byte
-        self.data_value = data_value  # bytes
-
-    def __repr__(self):
-        return 'PresentationDataValueItem(context_id={0}, ' \
-               'data_value="{1}")'.format(self.context_id, self.data_value)
-
-    @property
-    def item_length(self):
-        """Item length, excluding the header
-
-        :return: item length
-        :rtype: int
-        """
-        return len(self.data_value) + 1
-
-    def encode(self):
-        """Encodes item into bytes
-
-        :return: encoded item
-        :rtype: bytes
-        """
-        return b''.join([self.header.pack(self.item_length, self.context_id), self.data_value])
-
-    @classmethod
-    def decode(cls, stream):
-        """Decodes presentation data value item from data stream
-
-        Presentation data value is left in raw string format.
-        The Application Entity is responsible for dealing with it.
-
-        :param stream: raw data stream
-        :return: decoded presentation data value item
-        """
-        item_length, context_id = cls.header.unpack(stream.read(5))
-        data_value = stream.read(int(item_length) - 1)
-        return cls(context_id, data_value)
-
-    def total_length(self):
-        """Total item length, including the header
-
-        :return: total item length
-        :rtype: int
-        """
-        return 4 + self.item_length
@@ -0,0 +1,260 @@
+# Copyright (c) 2021 Pavel 'Blane' Tuchin
+# Copyright (c) 2012 Patrice Munger
+# This file is part of pynetdicom, released under a modified MIT license.
+#    See the file license.txt included with this distribution, also
+#    available at http://pynetdicom.googlecode.com
+#
+"""
+This module contains Presentation Data Value Item classes (PS 3.8 9.3.5.1), that are
+carried by P-DATA-TF PDU (:class:`~pynetdicom2.pdu.PDataTfPDU`):
+
+        * :class:`~pynetdicom2.pdvitems.PresentationDataValueItem` - item with in-memory
+          value, this is the only item type produced by decoding
+        * :class:`~pynetdicom2.pdvitems.BufferPresentationDataValueItem` - fragment of
+          in-memory dataset, message control header is kept apart from the value
+        * :class:`~pynetdicom2.pdvitems.FilePresentationDataValueItem` - fragment of a
+          dataset stored in a file, value is read (or sent) directly from the file
+
+Items are also available from :mod:`pynetdicom2.pdu` module.
+"""
+
+import struct
+from typing import Union  # pylint: disable=unused-import
+
+from . import exceptions
+
+
+class PresentationDataValueItem(object):
+    """Presentation Data Value Item (PS 3.8 9.3.5.1)
+
+    :ivar context_id: presentation context ID
+    :ivar data_value: item value (bytes)
+    """
+    header = struct.Struct('>I B')
+
+    def __init__(self, context_id, data_value):
+        # type: (int,bytes) -> None
+        self.context_id = context_id  # unsigned byte
+        self.data_value = data_value  # bytes
+
+    def __repr__(self):
+        return 'PresentationDataValueItem(context_id={0}, ' \
+               'data_value="{1}")'.format(self.context_id, self.data_value)
+
+    @property
+    def item_length(self):
+        """Item length, excluding the header
+
+        :return: item length
+        :rtype: int
+        """
+        return len(self.data_value) + 1
+
+    def encode(self):
+        """Encodes item into bytes
+
+        :return: encoded item
+        :rtype: bytes
+        """
+        return b''.join([self.header.pack(self.item_length, self.context_id), self.data_value])
+
+    def encode_into(self, buffer, offset):
+        """Encodes item into provided buffer at a given offset
+
+        :param buffer: buffer to encode item into
+        :type buffer: bytearray
+        :param offset: offset in the buffer
+        :type offset: int
+        :return: offset right after encoded item
+        :rtype: int
+        """
+        self.header.pack_into(buffer, offset, self.item_length, self.context_id)
+        offset += 5
+        end = offset + len(self.data_value)
+        buffer[offset:end] = self.data_value
+        return end
+
+    @classmethod
+    def decode(cls, stream):
+        """Decodes presentation data value item from data stream
+
+        Presentation data value is left in raw string format.
+        The Application Entity is responsible for dealing with it.
+
+        :param stream: raw data stream
+        :return: decoded presentation data value item
+        """
+        item_length, context_id = cls.header.unpack(stream.read(5))
+        data_value = stream.read(int(item_length) - 1)
+        return cls(context_id, data_value)
+
+    def total_length(self):
+        """Total item length, including the header
+
+        :return: total item length
+        :rtype: int
+        """
+        return 4 + self.item_length
+
+
+class BufferPresentationDataValueItem(object):
+    """Presentation Data Value Item with value stored in a memory buffer (PS 3.8 9.3.5.1)
+
+    Item is used for sending fragments of in-memory datasets. Message control header
+    is kept separately from the value, so value (usually a view into the whole encoded
+    dataset) is copied only once, when item is encoded. Item is never produced by decoding.
+
+    :ivar context_id: presentation context ID
+    :ivar message_control_header: message control header (first byte of PDV)
+    :ivar data_value: item value without the message control header
+    """
+    header = struct.Struct('>I B B')
+
+    def __init__(self, context_id, message_control_header, data_value):
+        # type: (int,int,Union[bytes,memoryview]) -> None
+        self.context_id = context_id  # unsigned byte
+        self.message_control_header = message_control_header  # unsigned byte
+        self.data_value = data_value
+
+    def __repr__(self):
+        return 'BufferPresentationDataValueItem(context_id={self.context_id}, ' \
+               'message_control_header={self.message_control_header}, ' \
+               'length={0})'.format(len(self.data_value), self=self)
+
+    @property
+    def item_length(self):
+        """Item length, excluding the header
+
+        :return: item length
+        :rtype: int
+        """
+        return len(self.data_value) + 2
+
+    def encode(self):
+        """Encodes item into bytes
+
+        :return: encoded item
+        :rtype: bytes
+        """
+        return b''.join([
+            self.header.pack(self.item_length, self.context_id, self.message_control_header),
+            self.data_value
+        ])
+
+    def encode_into(self, buffer, offset):
+        """Encodes item into provided buffer at a given offset
+
+        :param buffer: buffer to encode item into
+        :type buffer: bytearray
+        :param offset: offset in the buffer
+        :type offset: int
+        :return: offset right after encoded item
+        :rtype: int
+        """
+        self.header.pack_into(buffer, offset, self.item_length, self.context_id,
+                              self.message_control_header)
+        offset += self.header.size
+        end = offset + len(self.data_value)
+        buffer[offset:end] = self.data_value
+        return end
+
+    def total_length(self):
+        """Total item length, including the header
+
+        :return: total item length
+        :rtype: int
+        """
+        return 4 + self.item_length
+
+
+class FilePresentationDataValueItem(object):
+    """Presentation Data Value Item with value stored in a file (PS 3.8 9.3.5.1)
+
+    Item is used for sending datasets from files. Value is not read into memory
+    until item is encoded, which allows sending it directly from the file
+    (see :meth:`socket.socket.sendfile`). Item is never produced by decoding.
+
+    :ivar context_id: presentation context ID
+    :ivar message_control_header: message control header (first byte of PDV)
+    :ivar fp: file object, that contains item value
+    :ivar offset: value offset in the file
+    :ivar length: value length
+    """
+    header = struct.Struct('>I B B')
+
+    def __init__(self, context_id, message_control_header, fp, offset, length):
+        self.context_id = context_id  # unsigned byte
+        self.message_control_header = message_control_header  # unsigned byte
+        self.fp = fp
+        self.offset = offset
+        self.length = length
+
+    def __repr__(self):
+        return 'FilePresentationDataValueItem(context_id={self.context_id}, ' \
+               'message_control_header={self.message_control_header}, ' \
+               'offset={self.offset}, length={self.length})'.format(self=self)
+
+    @property
+    def item_length(self):
+        """Item length, excluding the header
+
+        :return: item length
+        :rtype: int
+        """
+        return self.length + 2
+
+    def encode_header(self):
+        """Encodes item header (including message control header) into bytes
+
+        :return: encoded item header
+        :rtype: bytes
+        """
+        return self.header.pack(self.item_length, self.context_id, self.message_control_header)
+
+    def encode(self):
+        """Encodes item into bytes
+
+        :return: encoded item
+        :rtype: bytes
+        """
+        self.fp.seek(self.offset)
+        value = self.fp.read(self.length)
+        if len(value) != self.length:
+            raise exceptions.PDUProcessingError(
+                'File ended {0} bytes short of PDV value'.format(self.length - len(value))
+            )
+        return self.encode_header() + value
+
+    def encode_into(self, buffer, offset):
+        """Encodes item into provided buffer at a given offset
+
+        :param buffer: buffer to encode item into
+        :type buffer: bytearray
+        :param offset: offset in the buffer
+        :type offset: int
+        :return: offset right after encoded item
+        :rtype: int
+        """
+        self.header.pack_into(buffer, offset, self.item_length, self.context_id,
+                              self.message_control_header)
+        offset += self.header.size
+        end = offset + self.length
+        self.fp.seek(self.offset)
+        view = memoryview(buffer)
+        while offset < end:
+            read = self.fp.readinto(view[offset:end])
+            if not read:
+                # buffer is reused, so stale bytes from previous PDU must never be sent
+                raise exceptions.PDUProcessingError(
+                    'File ended {0} bytes short of PDV value'.format(end - offset)
+                )
+            offset += read
+        return end
+
+    def total_length(self):
+        """Total item length, including the header
+
+        :return: total item length
+        :rtype: int
+        """
+        return 4 + self.item_length
@@ -45,9 +45,6 @@ arguments are provided by association and the rest are expected from service
 user.
 """
 
-from __future__ import absolute_import
-
-import six
 import pydicom
 from pydicom import filereader
 
@@ -169,6 +166,10 @@ def verification_scp(asce, ctx, msg):
     asce.send(rsp, ctx.id)
 
 
+def _after_sop_instance_uid(tag, *_):
+    return tag > 0x00080018
+
+
 @sop_classes([])
 def storage_scu(asce, ctx, dataset, msg_id):
     """Simple storage SCU role implementation.
@@ -186,7 +187,7 @@ def storage_scu(asce, ctx, dataset, msg_id):
     c_store.move_originator_aet = asce.ae.local_ae['aet']
     c_store.move_originator_message_id = msg_id
 
-    if isinstance(dataset, six.string_types):
+    if isinstance(dataset, str):
         # Got file name
         ds = open(dataset, 'rb')  # pylint: disable=consider-using-with
         zero = ds.tell()
@@ -202,8 +203,8 @@ def storage_scu(asce, ctx, dataset, msg_id):
             # by a bunch of ****s
             start = ds.tell()
             ds.seek(zero)
-            ds_full = pydicom.dcmread(ds, stop_before_pixels=True)
-            instance_uid = ds_full.SOPInstanceUID
+            ds_part = filereader.read_partial(ds, stop_when=_after_sop_instance_uid)
+            instance_uid = ds_part.SOPInstanceUID
             ds.seek(start)
 
         c_store.affected_sop_instance_uid = instance_uid
@@ -266,6 +266,7 @@ class ScpScuRoleSelectionSubItem(object):
     """
     item_type = 0x54
     header = struct.Struct('>B B H H')
+    roles = struct.Struct('B B')
 
     def __init__(self, sop_class_uid, scu_role, scp_role, reserved=0x00):
         # type: (uid.UID,int,int,int) -> None
@@ -305,7 +306,7 @@ class ScpScuRoleSelectionSubItem(object):
             [self.header.pack(self.item_type, self.reserved, self.item_length,
                               len(self.sop_class_uid)),
              self.sop_class_uid.encode(),
-             struct.pack('B B', self.scu_role, self.scp_role)])
+             self.roles.pack(self.scu_role, self.scp_role)])
 
     @classmethod
     def decode(cls, stream):
@@ -317,7 +318,7 @@ class ScpScuRoleSelectionSubItem(object):
         """
         _, reserved, _, uid_length = cls.header.unpack(stream.read(6))
         sop_class_uid = uid.UID(stream.read(uid_length).decode())
-        scu_role, scp_role = struct.unpack('B B', stream.read(2))
+        scu_role, scp_role = cls.roles.unpack(stream.read(2))
         return cls(reserved=reserved, sop_class_uid=sop_class_uid,
                    scu_role=scu_role, scp_role=scp_role)
 
@@ -404,6 +405,7 @@ class UserIdentityNegotiationSubItem(object):
     """
     item_type = 0x58
     header = struct.Struct('>B B H B B H')
+    secondary_field_length = struct.Struct('>H')
 
     def __init__(self, primary_field, secondary_field='', user_identity_type=2,
                  positive_response_req=0, reserved=0x00):
@@ -471,7 +473,7 @@ class UserIdentityNegotiationSubItem(object):
                               self.user_identity_type,
                               self.positive_response_req,
                               len(self._primary_field)),
-             self._primary_field, struct.pack('>H', len(self._secondary_field)),
+             self._primary_field, self.secondary_field_length.pack(len(self._secondary_field)),
              self._secondary_field])
 
     @classmethod
@@ -485,7 +487,7 @@ class UserIdentityNegotiationSubItem(object):
             positive_response_req, \
             primary_field_len = cls.header.unpack(stream.read(cls.header.size))
         primary_field = stream.read(primary_field_len)
-        secondary_field_len = struct.unpack('>H', stream.read(2))[0]
+        secondary_field_len = cls.secondary_field_length.unpack(stream.read(2))[0]
         secondary_field = stream.read(secondary_field_len)
         return cls(primary_field.decode('utf8'), secondary_field.decode('utf8'), user_identity_type,
                    positive_response_req, reserved)
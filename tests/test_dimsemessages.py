@@ -3,8 +3,14 @@
 #    See the file license.txt included with this distribution.
 __author__ = 'Blane'
 
+import gzip
+import os
+import tempfile
 import unittest
 import pynetdicom2.dimsemessages
+import pynetdicom2.dsutils
+import pynetdicom2.exceptions
+import pynetdicom2.pdu
 
 
 class MessageTesterBase(unittest.TestCase):
@@ -35,6 +41,31 @@ class CEchoRQMessage(MessageTesterBase):
         self.assertEqual(self.msg.sop_class_uid,
                          affected_sop_class_uid)
 
+    def test_set_length(self):
+        self.msg.message_id = 5
+        self.msg.sop_class_uid = '1.2.3.4.5'
+        self.msg.set_length()
+        encoded = pynetdicom2.dsutils.encode(self.msg.command_set, True, True)
+        self.assertEqual(self.msg.command_set.CommandGroupLength,
+                         len(encoded) - 12)
+
+    def test_encode_reused_message(self):
+        self.msg.sop_class_uid = '1.2.3.4.5'
+        self.msg.message_id = 5
+        self.msg.set_length()
+        first = self.msg.encode(1, 1024)
+        first_command_set = pynetdicom2.dsutils.encode(self.msg.command_set, True, True)
+
+        # message is modified before the first one is sent
+        self.msg.message_id = 6
+        self.msg.set_length()
+        second = self.msg.encode(1, 1024)
+
+        decoded = [pynetdicom2.dsutils.decode(p_data.encode()[12:], True, True)
+                   for p_data in (next(first), next(second))]
+        self.assertEqual(pynetdicom2.dsutils.encode(decoded[0], True, True), first_command_set)
+        self.assertEqual([ds.MessageID for ds in decoded], [5, 6])
+
 
 class CEchoRSPMessage(MessageTesterBase):
     def setUp(self):
@@ -97,6 +128,35 @@ class CStoreRQMessage(MessageTesterBase):
         self.assertEqual(self.msg.move_originator_message_id,
                          move_originator_message_id)
 
+    def _encode_data_set(self, data_set):
+        self.msg.data_set = data_set
+        # items are encoded while iterating, file is closed once all PDUs are produced
+        encoded_items = [(item, item.encode()) for p_data in self.msg.encode(1, 1024)
+                         for item in p_data.data_value_items]
+        return [(item, encoded) for item, encoded in encoded_items if encoded[5] in (0, 2)]
+
+    def test_encode_data_set_from_file(self):
+        payload = os.urandom(3000)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_name = os.path.join(tmp_dir, 'ds.bin')
+            with open(file_name, 'wb') as fp:
+                fp.write(payload)
+            value_items = self._encode_data_set(open(file_name, 'rb'))
+        self.assertTrue(all(isinstance(item, pynetdicom2.pdu.FilePresentationDataValueItem)
+                            for item, _ in value_items))
+        self.assertEqual(b''.join(encoded[6:] for _, encoded in value_items), payload)
+
+    def test_encode_data_set_from_wrapped_file(self):
+        payload = os.urandom(3000)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_name = os.path.join(tmp_dir, 'ds.gz')
+            with gzip.open(file_name, 'wb') as fp:
+                fp.write(payload)
+            value_items = self._encode_data_set(gzip.open(file_name, 'rb'))
+        self.assertFalse(any(isinstance(item, pynetdicom2.pdu.FilePresentationDataValueItem)
+                             for item, _ in value_items))
+        self.assertEqual(b''.join(encoded[6:] for _, encoded in value_items), payload)
+
 
 class CStoreRSPMessage(MessageTesterBase):
     def setUp(self):
@@ -520,3 +580,40 @@ class NDeleteRSPMessage(MessageTesterBase):
         self.assertEqual(self.msg.sop_class_uid, '')
         self.assertEqual(self.msg.status, '')
         self.assertEqual(self.msg.affected_sop_instance_uid, '')
+
+
+class MessageFromCommandSet(unittest.TestCase):
+    def test_known_command_field(self):
+        command_set = pynetdicom2.dimsemessages.CEchoRSPMessage().command_set
+        msg = pynetdicom2.dimsemessages.message_from_command_set(command_set)
+        self.assertIsInstance(msg, pynetdicom2.dimsemessages.CEchoRSPMessage)
+        self.assertIs(msg.command_set, command_set)
+
+    def test_unknown_command_field(self):
+        command_set = pynetdicom2.dimsemessages.CEchoRSPMessage().command_set
+        command_set.CommandField = 0x7FFF
+        with self.assertRaises(pynetdicom2.exceptions.DIMSEProcessingError):
+            pynetdicom2.dimsemessages.message_from_command_set(command_set)
+
+
+class EncodeCommandSet(unittest.TestCase):
+    def test_matches_generic_encoder(self):
+        for msg_type in pynetdicom2.dimsemessages.MESSAGE_TYPE.values():
+            command_set = msg_type().command_set
+            for elem in command_set:
+                if elem.VR in ('US', 'UL'):
+                    elem.value = 7
+                elif elem.VR == 'UI':
+                    elem.value = '1.2.3.45'
+                elif elem.VR == 'AE':
+                    elem.value = 'AET'
+                elif elem.VR == 'AT':
+                    elem.value = [0x00100010, 0x00080018]
+            self.assertEqual(pynetdicom2.dsutils.encode_command_set(command_set),
+                             pynetdicom2.dsutils.encode(command_set, True, True))
+
+    def test_non_ascii_text(self):
+        command_set = pynetdicom2.dimsemessages.CEchoRSPMessage().command_set
+        command_set.ErrorComment = 'Erreur réseau'
+        self.assertEqual(pynetdicom2.dsutils.encode_command_set(command_set),
+                         pynetdicom2.dsutils.encode(command_set, True, True))
@@ -1,11 +1,10 @@
 __author__ = 'Blane'
 
 import os
+import tempfile
 import threading
 import unittest
 
-from six.moves import range  # type: ignore
-
 import pydicom
 from pydicom import uid
 from pydicom import dataset
@@ -13,6 +12,7 @@ from pydicom import dataset
 import pynetdicom2.applicationentity as ae
 import pynetdicom2.sopclass as sc
 
+from pynetdicom2 import exceptions
 from pynetdicom2 import statuses
 
 from pynetdicom2 import c_find
@@ -34,6 +34,56 @@ class CEchoTestCase(unittest.TestCase):
                 result = service(1)
                 self.assertTrue(result.is_success)
 
+    def test_associations_handled_by_daemon_threads(self):
+        handler_threads = []
+
+        class EchoAE(ae.AE):
+            def on_receive_echo(self, context):
+                handler_threads.append(threading.current_thread())
+                return statuses.SUCCESS
+
+        ae1 = ae.ClientAE('AET1').add_scu(sc.verification_scu)
+        ae2 = EchoAE('AET2', 11112, bind_and_activate=False).add_scp(sc.verification_scp)
+        with ae2:
+            remote_ae = dict(address='127.0.0.1', port=11112, aet='AET2')
+            with ae1.request_association(remote_ae) as assoc:
+                result = assoc.get_scu(sc.VERIFICATION_SOP_CLASS)(1)
+                self.assertTrue(result.is_success)
+        self.assertEqual(len(handler_threads), 1)
+        self.assertTrue(handler_threads[0].daemon)
+
+    def test_max_associations_validated(self):
+        with self.assertRaises(ValueError):
+            ae.AE('AET2', 11112, bind_and_activate=False, max_associations=0)
+
+    def test_association_rejected_when_busy(self):
+        ae1 = ae.ClientAE('AET1').add_scu(sc.verification_scu)
+        ae2 = ae.AE('AET2', 11112, bind_and_activate=False,
+                    max_associations=1).add_scp(sc.verification_scp)
+        with ae2:
+            remote_ae = dict(address='127.0.0.1', port=11112, aet='AET2')
+            with ae1.request_association(remote_ae):
+                with self.assertRaises(exceptions.AssociationRejectedError) as ctx:
+                    with ae1.request_association(remote_ae):
+                        pass
+                self.assertEqual(ctx.exception.result, 2)
+                self.assertEqual(ctx.exception.source, 3)
+                self.assertEqual(ctx.exception.diagnostic, 2)
+
+    def test_connection_closed_when_rejection_pool_busy(self):
+        class NoRejectAE(ae.AE):
+            max_rejecting = 0
+
+        ae1 = ae.ClientAE('AET1').add_scu(sc.verification_scu)
+        ae2 = NoRejectAE('AET2', 11112, bind_and_activate=False,
+                         max_associations=1).add_scp(sc.verification_scp)
+        with ae2:
+            remote_ae = dict(address='127.0.0.1', port=11112, aet='AET2')
+            with ae1.request_association(remote_ae):
+                with self.assertRaises(exceptions.AssociationAbortedError):
+                    with ae1.request_association(remote_ae):
+                        pass
+
 
 class CFindServerAE(ae.AE):
     def __init__(self, test_name, test, *args, **kwargs):
@@ -88,9 +138,11 @@ class CStoreAE(ae.AE):
         ae.AE.__init__(self, max_pdu_length=1024, bind_and_activate=False, *args, **kwargs)
         self.test = test
         self.rq = rq
+        self.received = []
 
     def on_receive_store(self, context, ds):
         d = pydicom.dcmread(ds)
+        self.received.append(d.SOPInstanceUID)
         self.test.assertEqual(context.sop_class, self.rq.SOPClassUID)
         self.test.assertEqual(d.PatientName, self.rq.PatientName)
         self.test.assertEqual(d.StudyInstanceUID, self.rq.StudyInstanceUID)
@@ -135,6 +187,31 @@ class CStoreTestCase(unittest.TestCase):
                 status = service(file_name, 1)
                 self.assertTrue(status.is_success)
 
+    def test_add_storage_scu_without_sop_classes(self):
+        self.assertEqual(sc.storage_scu.sop_classes, [])
+        ae1 = ae.ClientAE('AET1').add_scu(sc.storage_scu)
+        self.assertNotIn(sc.COMPREHENSIVE_SR_STORAGE, ae1.supported_scu)
+
+    def test_c_store_from_file_without_sop_instance_uid_in_meta(self):
+        rq = pydicom.dcmread(os.path.join(BASE_PATH, 'test_sr.dcm'))
+        del rq.file_meta.MediaStorageSOPInstanceUID
+
+        ae1 = ae.ClientAE('AET1', [uid.ExplicitVRLittleEndian], max_pdu_length=1024)\
+            .add_scu(sc.storage_scu)
+        ae1.update_context_def_list([sc.COMPREHENSIVE_SR_STORAGE])
+        ae2 = CStoreAE(self, rq, 'AET2', 11112).add_scp(sc.storage_scp)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_name = os.path.join(tmp_dir, 'test_sr.dcm')
+            rq.save_as(file_name, write_like_original=True)
+            with ae2:
+                remote_ae = dict(address='127.0.0.1', port=11112, aet='AET2')
+                with ae1.request_association(remote_ae) as assoc:
+                    pc_id, _ = assoc.sop_classes_as_scu[sc.COMPREHENSIVE_SR_STORAGE]
+                    status = sc.storage_scu(assoc, assoc.accepted_contexts[pc_id], file_name, 1)
+                    self.assertTrue(status.is_success)
+
+        self.assertEqual(ae2.received, [rq.SOPInstanceUID])
+
 
 class CommitmentAE(ae.AE):
     def __init__(self, test, transaction, success, failure, event, remote_ae,
@@ -4,16 +4,13 @@
 
 __author__ = 'Blane'
 
+from io import BytesIO
 import unittest
-import six
+
+import pynetdicom2.exceptions
 import pynetdicom2.pdu
 import pynetdicom2.userdataitems
 
-if six.PY3:
-    from six import BytesIO as cStringIO
-else:
-    from six.moves import cStringIO
-
 
 class TestPDUEncoding(unittest.TestCase):
     def compare_pdu(self, pdu1, pdu2):
@@ -37,11 +34,83 @@ class TestPDUEncoding(unittest.TestCase):
             variable_items=[])
         self.decode_and_compare(pdu)
 
+    def test_a_associate_rq_pdu_items(self):
+        app_ctx = pynetdicom2.pdu.ApplicationContextItem('1.2.840.10008.3.1.1.1')
+        pres_ctx = pynetdicom2.pdu.PresentationContextItemRQ(
+            1, pynetdicom2.pdu.AbstractSyntaxSubItem('1.2.840.10008.1.1'),
+            [pynetdicom2.pdu.TransferSyntaxSubItem('1.2.840.10008.1.2')])
+        user_info = pynetdicom2.pdu.UserInformationItem(
+            [pynetdicom2.userdataitems.MaximumLengthSubItem(16384)])
+        pdu = pynetdicom2.pdu.AAssociateRqPDU(
+            called_ae_title='aet1',
+            calling_ae_title='aet2',
+            variable_items=[app_ctx, pres_ctx, user_info])
+        pdu = type(pdu).decode(pdu.encode())
+        self.assertEqual(pdu.application_context.context_name, app_ctx.context_name)
+        self.assertEqual([ctx.context_id for ctx in pdu.presentation_contexts], [1])
+        # property can be iterated more than once
+        self.assertEqual(len(pdu.presentation_contexts), 1)
+        self.assertEqual(pdu.presentation_contexts[0].context_id, 1)
+        self.assertEqual(pdu.user_information.user_data[0].maximum_length_received, 16384)
+
+    def test_p_data_tf_pdu_encode_into(self):
+        pdu = pynetdicom2.pdu.PDataTfPDU([
+            pynetdicom2.pdu.PresentationDataValueItem(1, b'\x03command'),
+            pynetdicom2.pdu.PresentationDataValueItem(1, b'\x02dataset')
+        ])
+        buffer = bytearray(4)
+        length = pdu.encode_into(buffer)
+        self.assertEqual(bytes(buffer[:length]), pdu.encode())
+
+        # buffer is reused for smaller PDUs
+        pdu = pynetdicom2.pdu.PDataTfPDU([pynetdicom2.pdu.PresentationDataValueItem(3, b'\x02')])
+        length = pdu.encode_into(buffer)
+        self.assertEqual(bytes(buffer[:length]), pdu.encode())
+
+    def test_p_data_tf_pdu_file_item(self):
+        fp = BytesIO(b'preamble' + b'dataset')
+        file_pdu = pynetdicom2.pdu.PDataTfPDU([
+            pynetdicom2.pdu.FilePresentationDataValueItem(1, 2, fp, 8, 7)
+        ])
+        pdu = pynetdicom2.pdu.PDataTfPDU([
+            pynetdicom2.pdu.PresentationDataValueItem(1, b'\x02dataset')
+        ])
+        self.assertEqual(file_pdu.encode(), pdu.encode())
+
+        buffer = bytearray()
+        length = file_pdu.encode_into(buffer)
+        self.assertEqual(bytes(buffer[:length]), pdu.encode())
+
+    def test_p_data_tf_pdu_truncated_file_item(self):
+        fp = BytesIO(b'preamble' + b'data')
+        file_pdu = pynetdicom2.pdu.PDataTfPDU([
+            pynetdicom2.pdu.FilePresentationDataValueItem(1, 2, fp, 8, 7)
+        ])
+        with self.assertRaises(pynetdicom2.exceptions.PDUProcessingError):
+            file_pdu.encode()
+
+        buffer = bytearray(b'stale' * 10)
+        with self.assertRaises(pynetdicom2.exceptions.PDUProcessingError):
+            file_pdu.encode_into(buffer)
+
+    def test_p_data_tf_pdu_buffer_item(self):
+        buffer_pdu = pynetdicom2.pdu.PDataTfPDU([
+            pynetdicom2.pdu.BufferPresentationDataValueItem(1, 2, memoryview(b'dataset'))
+        ])
+        pdu = pynetdicom2.pdu.PDataTfPDU([
+            pynetdicom2.pdu.PresentationDataValueItem(1, b'\x02dataset')
+        ])
+        self.assertEqual(buffer_pdu.encode(), pdu.encode())
+
+        buffer = bytearray()
+        length = buffer_pdu.encode_into(buffer)
+        self.assertEqual(bytes(buffer[:length]), pdu.encode())
+
 
 class TestSubItemEncoding(unittest.TestCase):
     def decode_and_compare_sub_item(self, item):
         encoded = item.encode()
-        stream = cStringIO(encoded)
+        stream = BytesIO(encoded)
         item2 = type(item).decode(stream)
         self.assertIsInstance(item, item2.__class__)
         self.assertEqual(item.__dict__, item2.__dict__)